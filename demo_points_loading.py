@@ -7,10 +7,41 @@ This script demonstrates how the enhanced VAV emulator loads and processes
 points from the CSV file without starting the actual BACnet service.
 """
 
-import csv
+import mmap
+import sys
 import re
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 
+# pandas and pyarrow are optional — when available the CSV is parsed with
+# vectorized column operations instead of the row-at-a-time Python loop.
+# pyarrow is preferred: its multi-threaded C++ tokenizer parses straight
+# into columnar buffers without creating a Python object per field.
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    pa = None
+
+# Precompiled patterns for the hot CSV parsing path (compiled once, reused per row)
+_MS_RE = re.compile(r'\[(\d+)\]')
+_NUM_RE = re.compile(r'-?\d+(?:\.\d+)?')
+# Every standard object type the emulator knows how to create
+_ALL_TYPES = frozenset(('Analog Input', 'Analog Output', 'Analog Value',
+                        'Binary Input', 'Binary Output', 'Binary Value',
+                        'Multi State Input', 'Multi State Output', 'Multi State Value'))
+
+# Combined multistate-or-numeric pattern: one scan of the value string
+# instead of a "[n]" pass followed by a numeric pass
+_PV_RE = re.compile(r'\[(\d+)\]|(-?\d+(?:\.\d+)?)')
+
 
 def parse_present_value(value: str) -> float:
     """Extract numeric value from CSV present value strings"""
@@ -18,95 +49,197 @@ def parse_present_value(value: str) -> float:
         return 0.0
     
     value = str(value).strip()
-    
-    # Handle multistate values like "[1] Cooling"
-    match = re.search(r'\[(\d+)\]', value)
-    if match:
-        return float(match.group(1))
-    
-    # Handle numeric values with units like "72.9 °F" or "100 %"
-    match = re.search(r'(-?\d+(?:\.\d+)?)', value)
+
+    # Fast path: most cells are a plain number ("72.9") or a number
+    # followed by a unit ("72.9 °F") — float() is a C builtin, so try it
+    # on the whole string and then on the first token before paying for
+    # the regex scan
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    head = value.split(' ', 1)[0]
+    if head != value:
+        try:
+            return float(head)
+        except ValueError:
+            pass
+
+    # One pass handles both multistate values like "[1] Cooling" and
+    # numeric values with units like "72.9 °F" or "100 %"
+    match = _PV_RE.search(value)
     if match:
-        return float(match.group(1))
-    
+        ms_index, number = match.groups()
+        return float(ms_index if ms_index is not None else number)
+
     return 0.0
 
 
+@lru_cache(maxsize=4096)
 def parse_multistate_states(description: str) -> list:
     """Parse multistate description to extract state text list"""
     if not description:
         return ["State1", "State2"]
     
-    # Look for patterns like "[1]=State1, [2]=State2, ..."
-    states = []
-    matches = re.findall(r'\[(\d+)\]=([^,\]]+)', description)
-    if matches:
-        # Sort by state number and extract state text
-        sorted_matches = sorted(matches, key=lambda x: int(x[0]))
-        states = [match[1].strip() for match in sorted_matches]
-    
+    # Look for patterns like "[1]=State1, [2]=State2, ..." with a plain
+    # two-pointer scan — the tokens are too simple to pay for the regex
+    # engine on every (short) description string
+    pairs = []
+    find = description.find
+    length = len(description)
+    pos = 0
+    while True:
+        lbracket = find('[', pos)
+        if lbracket == -1:
+            break
+        rbracket = find(']', lbracket + 1)
+        if rbracket == -1:
+            break
+        index_str = description[lbracket + 1:rbracket]
+        if not index_str.isdigit() or description[rbracket + 1:rbracket + 2] != '=':
+            pos = lbracket + 1
+            continue
+        # State text runs to the next ',' or ']' (or end of string)
+        start = rbracket + 2
+        end = length
+        comma = find(',', start)
+        if comma != -1:
+            end = comma
+        bracket = find(']', start)
+        if bracket != -1 and bracket < end:
+            end = bracket
+        text = description[start:end].strip()
+        if end > start:
+            pairs.append((int(index_str), text))
+        pos = end
+
+    # Sort by state number and extract state text
+    pairs.sort()
+    states = [text for _, text in pairs]
+
     return states if states else ["State1", "State2"]
 
 
+# Keyword → units rules scanned in order; first hit wins. Each rule matches
+# against the lowered name ('n') or present-value string ('p'). 'T' is a
+# sentinel for temperature points, resolved to °F/°C from the value string.
+_UNIT_RULES = (
+    ('n', 'temperature', 'T'),
+    ('n', 'temp', 'T'),
+    ('n', 'flow', 'cubicFeetPerMinute'),
+    ('p', 'cfm', 'cubicFeetPerMinute'),
+    ('n', 'percent', 'percent'),
+    ('p', '%', 'percent'),
+    ('n', 'humidity', 'percentRelativeHumidity'),
+    ('n', 'pressure', 'pascals'),
+    ('n', 'speed', 'percent'),
+)
+
+
+@lru_cache(maxsize=4096)
 def determine_units(name: str, present_value_str: str) -> str:
     """Determine appropriate units based on point name and value"""
     name_lower = name.lower()
     pv_lower = str(present_value_str).lower()
-    
-    if 'temperature' in name_lower or 'temp' in name_lower:
-        if '°f' in pv_lower or 'fahrenheit' in pv_lower:
-            return 'degreesFahrenheit'
-        return 'degreesCelsius'
-    elif 'flow' in name_lower or 'cfm' in pv_lower:
-        return 'cubicFeetPerMinute'
-    elif 'percent' in name_lower or '%' in pv_lower:
-        return 'percent'
-    elif 'humidity' in name_lower:
-        return 'percentRelativeHumidity'
-    elif 'pressure' in name_lower:
-        return 'pascals'
-    elif 'speed' in name_lower:
-        return 'percent'
-    else:
-        return 'noUnits'
 
+    for source, keyword, units in _UNIT_RULES:
+        if keyword in (name_lower if source == 'n' else pv_lower):
+            if units == 'T':
+                if '°f' in pv_lower or 'fahrenheit' in pv_lower:
+                    return 'degreesFahrenheit'
+                return 'degreesCelsius'
+            return units
+    return 'noUnits'
 
-def demo_csv_loading(csv_file: str = "points.csv"):
-    """Demonstrate loading and parsing the CSV file"""
-    print("="*70)
-    print("ENHANCED VAV EMULATOR - CSV POINT LOADING DEMO")
-    print("="*70)
-    
-    # Check if file exists
-    points_path = Path(csv_file)
-    if not points_path.exists():
-        print(f"❌ Points file not found: {csv_file}")
-        return
-    
-    print(f"✓ Loading points from: {csv_file}")
-    print()
-    
-    # Load and process points
-    points_by_type = {}
+
+def _iter_csv_records(mm):
+    """Yield rows of byte-string fields from a memory-mapped CSV
+
+    Fields are located with bytes.find on the mapped buffer — quoted
+    fields (including embedded commas/newlines and doubled quotes) are
+    handled, but nothing is decoded here; callers decode only the
+    columns they actually consume.
+    """
+    size = len(mm)
+    pos = 0
+    while pos < size:
+        fields = []
+        end_of_record = False
+        while not end_of_record:
+            if mm[pos:pos + 1] == b'"':
+                # Quoted field: scan for the closing quote, treating "" as
+                # an escaped literal quote
+                end = pos + 1
+                while True:
+                    quote = mm.find(b'"', end)
+                    if quote == -1:
+                        quote = size
+                        break
+                    if mm[quote + 1:quote + 2] == b'"':
+                        end = quote + 2
+                    else:
+                        break
+                fields.append(mm[pos + 1:quote].replace(b'""', b'"'))
+                pos = quote + 1
+                if mm[pos:pos + 1] == b',':
+                    pos += 1
+                else:
+                    newline = mm.find(b'\n', pos)
+                    pos = size if newline == -1 else newline + 1
+                    end_of_record = True
+            else:
+                comma = mm.find(b',', pos)
+                newline = mm.find(b'\n', pos)
+                if newline == -1:
+                    newline = size
+                if comma != -1 and comma < newline:
+                    fields.append(mm[pos:comma])
+                    pos = comma + 1
+                else:
+                    raw = mm[pos:newline]
+                    if raw.endswith(b'\r'):
+                        raw = raw[:-1]
+                    fields.append(raw)
+                    pos = newline + 1
+                    end_of_record = True
+        if len(fields) == 1 and not fields[0]:
+            continue  # blank line
+        yield fields
+
+
+def _load_points_stdlib(points_path) -> tuple:
+    """Load and group points without third-party parsers
+
+    mmaps the file and walks it with byte-level find calls, so no
+    per-row list-of-str allocation happens for the columns we never
+    read — only the five consumed fields are decoded per row.
+    """
+    points_by_type = defaultdict(list)
     total_points = 0
-    
-    with open(points_path, 'r', newline='') as csvfile:
-        reader = csv.DictReader(csvfile)
-        
-        for row in reader:
-            obj_type = row['Type'].strip()
-            instance = int(row['Instance'])
-            name = row['Name'].strip()
-            present_value_str = row['PresentValue']
-            description = row.get('Description', '').strip()
-            
+
+    with open(points_path, 'rb') as csvfile:
+        mm = mmap.mmap(csvfile.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        records = _iter_csv_records(mm)
+
+        # Resolve column positions once from the header; indexing rows
+        # by position avoids DictReader's per-row dict allocation
+        header = [h.decode('utf-8-sig') for h in next(records, [])]
+        idx = {h: i for i, h in enumerate(header)}
+        ti, ii, ni, pi, di = (idx['Type'], idx['Instance'], idx['Name'],
+                              idx['PresentValue'], idx.get('Description', -1))
+
+        for row in records:
+            obj_type = row[ti].decode('utf-8').strip()
+            instance = int(row[ii])
+            name = row[ni].decode('utf-8').strip()
+            present_value_str = row[pi].decode('utf-8')
+            description = row[di].decode('utf-8').strip() if 0 <= di < len(row) else ''
+
             present_value = parse_present_value(present_value_str)
             units = determine_units(name, present_value_str)
-            
-            # Group by object type
-            if obj_type not in points_by_type:
-                points_by_type[obj_type] = []
-            
+
             point_info = {
                 'instance': instance,
                 'name': name,
@@ -115,73 +248,187 @@ def demo_csv_loading(csv_file: str = "points.csv"):
                 'units': units,
                 'description': description
             }
-            
+
             # Add multistate info if applicable
             if 'Multi State' in obj_type:
                 point_info['states'] = parse_multistate_states(description)
-            
+
             points_by_type[obj_type].append(point_info)
             total_points += 1
-    
-    # Display results
-    print(f"📊 LOADED {total_points} TOTAL POINTS")
+    finally:
+        mm.close()
+
+    return points_by_type, total_points
+
+
+def _load_points_pandas(points_path) -> tuple:
+    """Load and group points with pandas vectorized column operations
+
+    Produces the same structures as _load_points_stdlib, but the hot
+    per-row parsing (numeric extraction, unit classification) runs as a
+    few compiled passes over whole columns instead of N Python loop
+    iterations.
+    """
+    df = pd.read_csv(points_path, dtype=str).fillna('')
+    return _group_points_from_dataframe(df)
+
+
+def _load_points_arrow(points_path) -> tuple:
+    """Load and group points via pyarrow's multi-threaded CSV reader
+
+    Tokenizing happens in C++ into Arrow columnar buffers (no Python
+    object per cell); the columns are then handed to the shared pandas
+    pipeline for vectorized parsing and grouping.
+    """
+    string_columns = ('Type', 'Name', 'PresentValue', 'Description')
+    table = pacsv.read_csv(
+        str(points_path),
+        read_options=pacsv.ReadOptions(block_size=1 << 20),
+        convert_options=pacsv.ConvertOptions(
+            column_types={col: pa.string() for col in string_columns}))
+    df = table.to_pandas()
+    for col in string_columns:
+        if col in df.columns:
+            df[col] = df[col].fillna('')
+    return _group_points_from_dataframe(df)
+
+
+def _group_points_from_dataframe(df) -> tuple:
+    """Vectorized parse + group of an all-string points DataFrame"""
+    types = df['Type'].str.strip()
+    names = df['Name'].str.strip()
+    pv_strs = df['PresentValue']
+    if 'Description' in df.columns:
+        descriptions = df['Description'].str.strip()
+    else:
+        descriptions = pd.Series([''] * len(df))
+
+    # Numeric present value: multistate "[n] ..." index first, then the
+    # first numeric literal, defaulting to 0.0 — same as parse_present_value
+    ms = pv_strs.str.extract(_MS_RE.pattern, expand=False)
+    num = pv_strs.str.extract(f'({_NUM_RE.pattern})', expand=False)
+    present_values = pd.to_numeric(ms.fillna(num), errors='coerce').fillna(0.0)
+
+    # Unit classification: replay _UNIT_RULES as an ordered np.select so
+    # the first matching rule wins, exactly like determine_units
+    name_lower = names.str.lower()
+    pv_lower = pv_strs.str.lower()
+    fahrenheit = (pv_lower.str.contains('°f', regex=False) |
+                  pv_lower.str.contains('fahrenheit', regex=False))
+    conditions = []
+    choices = []
+    for source, keyword, units in _UNIT_RULES:
+        hit = (name_lower if source == 'n' else pv_lower).str.contains(keyword, regex=False)
+        if units == 'T':
+            conditions += [hit & fahrenheit, hit]
+            choices += ['degreesFahrenheit', 'degreesCelsius']
+        else:
+            conditions.append(hit)
+            choices.append(units)
+    all_units = np.select(conditions, choices, default='noUnits')
+
+    points_by_type = defaultdict(list)
+    total_points = 0
+    for obj_type, instance, name, pv, pv_str, units, description in zip(
+            types, df['Instance'].astype(int), names, present_values,
+            pv_strs, all_units, descriptions):
+        point_info = {
+            'instance': int(instance),
+            'name': name,
+            'present_value': float(pv),
+            'present_value_str': pv_str,
+            'units': str(units),
+            'description': description
+        }
+        if 'Multi State' in obj_type:
+            point_info['states'] = parse_multistate_states(description)
+        points_by_type[obj_type].append(point_info)
+        total_points += 1
+
+    return points_by_type, total_points
+
+
+def demo_csv_loading(csv_file: str = "points.csv"):
+    """Demonstrate loading and parsing the CSV file"""
     print("="*70)
-    
+    print("ENHANCED VAV EMULATOR - CSV POINT LOADING DEMO")
+    print("="*70)
+
+    # Check if file exists
+    points_path = Path(csv_file)
+    if not points_path.exists():
+        print(f"❌ Points file not found: {csv_file}")
+        return
+
+    print(f"✓ Loading points from: {csv_file}")
+    print()
+
+    # Load and process points (vectorized when pyarrow/pandas is installed)
+    if pa is not None and pd is not None:
+        points_by_type, total_points = _load_points_arrow(points_path)
+    elif pd is not None:
+        points_by_type, total_points = _load_points_pandas(points_path)
+    else:
+        points_by_type, total_points = _load_points_stdlib(points_path)
+
+    # Display results — assembled into one buffer and flushed with a single
+    # stdout write instead of one locked print call per line
+    buf = []
+    out = buf.append
+    out(f"📊 LOADED {total_points} TOTAL POINTS")
+    out("="*70)
+
     for obj_type, points in points_by_type.items():
-        print(f"\n🔹 {obj_type.upper()} ({len(points)} objects)")
-        print("-" * (len(obj_type) + 15))
-        
+        out(f"\n🔹 {obj_type.upper()} ({len(points)} objects)")
+        out("-" * (len(obj_type) + 15))
+
         for point in points[:3]:  # Show first 3 of each type
-            print(f"   Instance {point['instance']:3d}: {point['name']}")
-            print(f"                    Value: {point['present_value_str']}")
-            print(f"                    Units: {point['units']}")
+            out(f"   Instance {point['instance']:3d}: {point['name']}")
+            out(f"                    Value: {point['present_value_str']}")
+            out(f"                    Units: {point['units']}")
             if 'states' in point and point['states']:
-                print(f"                    States: {', '.join(point['states'][:3])}...")
-            print()
-        
+                out(f"                    States: {', '.join(point['states'][:3])}...")
+            out("")
+
         if len(points) > 3:
-            print(f"   ... and {len(points) - 3} more {obj_type.lower()} objects")
-            print()
-    
+            out(f"   ... and {len(points) - 3} more {obj_type.lower()} objects")
+            out("")
+
     # Check for missing object types
-    print("\n📋 MISSING OBJECT TYPE ANALYSIS")
-    print("-" * 35)
-    
-    all_types = {'Analog Input', 'Analog Output', 'Analog Value',
-                 'Binary Input', 'Binary Output', 'Binary Value',
-                 'Multi State Input', 'Multi State Output', 'Multi State Value'}
-    
-    existing_types = set(points_by_type.keys())
-    missing_types = all_types - existing_types
-    
+    out("\n📋 MISSING OBJECT TYPE ANALYSIS")
+    out("-" * 35)
+
+    missing_types = _ALL_TYPES - points_by_type.keys()
+
     if missing_types:
-        print("Missing object types (will be auto-generated if enabled in INI):")
+        out("Missing object types (will be auto-generated if enabled in INI):")
         for missing_type in sorted(missing_types):
-            print(f"   • {missing_type}")
+            out(f"   • {missing_type}")
     else:
-        print("✓ All standard object types are present in CSV")
-    
-    print("\n🔧 SIMULATION FEATURES")
-    print("-" * 25)
-    print("The enhanced emulator will provide:")
-    print("• Realistic temperature cycles for outdoor sensors")
-    print("• Space temperature drift simulation")
-    print("• Airflow variations with noise")
-    print("• Humidity random walk")
-    print("• Binary input state changes")
-    print("• Multistate transitions")
-    print("• Output changes for priority 16 writes")
-    print("• Environmental modeling")
-    
-    print("\n🚀 NEXT STEPS")
-    print("-" * 15)
-    print("1. Configure vav.ini for your network settings")
-    print("2. Run: python virtual_vav_device.py")
-    print("3. Connect with a BACnet client (VTS, YABE, etc.)")
-    print("4. Monitor realistic point behavior")
-    print("5. Test priority array writes")
-    
-    print("\n" + "="*70)
+        out("✓ All standard object types are present in CSV")
+
+    out("\n🔧 SIMULATION FEATURES")
+    out("-" * 25)
+    out("The enhanced emulator will provide:")
+    out("• Realistic temperature cycles for outdoor sensors")
+    out("• Space temperature drift simulation")
+    out("• Airflow variations with noise")
+    out("• Humidity random walk")
+    out("• Binary input state changes")
+    out("• Multistate transitions")
+    out("• Output changes for priority 16 writes")
+    out("• Environmental modeling")
+
+    out("\n🚀 NEXT STEPS")
+    out("-" * 15)
+    out("1. Configure vav.ini for your network settings")
+    out("2. Run: python virtual_vav_device.py")
+    out("3. Connect with a BACnet client (VTS, YABE, etc.)")
+    out("4. Monitor realistic point behavior")
+    out("5. Test priority array writes")
+
+    out("\n" + "="*70)
+    sys.stdout.write('\n'.join(buf) + '\n')
 
 
 if __name__ == "__main__":
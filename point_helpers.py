@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Shared BACnet point-creation helpers
+====================================
+
+``virtual_device``, ``vav_emulator`` and ``virtual_vav_device`` all wrap
+BAC0's object factories with the same thin ``add_*`` functions; they
+live here once so the three entry points stay in sync. Each helper
+registers the object with the application and returns the bacpypes3
+instance the factory created (the factory keeps it in its ``objects``
+mapping keyed by name, so no second lookup through ``app[name]`` is
+needed).
+"""
+
+from BAC0.core.devices.local.factory import (
+    analog_input, analog_output, analog_value,
+    binary_input, binary_output, binary_value,
+    multistate_input, multistate_output, multistate_value
+)
+
+
+def add_ai(app, inst, name, units, val=0, desc=""):
+    obj = analog_input(instance=inst, name=name,
+                       properties={"units": units},
+                       description=desc or name,
+                       presentValue=val)
+    obj.add_objects_to_application(app)
+    return obj.objects[name]
+
+def add_ao(app, inst, name, units, val=0, desc=""):
+    obj = analog_output(instance=inst, name=name,
+                        properties={"units": units},
+                        description=desc or name,
+                        presentValue=val,
+                        relinquish_default=val            # commandable
+                        )
+    obj.add_objects_to_application(app)
+    return obj.objects[name]
+
+def add_av(app, inst, name, units, val=0, desc=""):
+    obj = analog_value(instance=inst, name=name,
+                       properties={"units": units},
+                       description=desc or name,
+                       presentValue=val,
+                       relinquish_default=val            # commandable
+                       )
+    obj.add_objects_to_application(app)
+    return obj.objects[name]
+
+def add_bi(app, inst, name, val=False, desc=""):
+    obj = binary_input(instance=inst, name=name,
+                       description=desc or name,
+                       presentValue=val)
+    obj.add_objects_to_application(app)
+    return obj.objects[name]
+
+def add_bo(app, inst, name, val=False, desc=""):
+    obj = binary_output(instance=inst, name=name,
+                        description=desc or name,
+                        presentValue=val,
+                        relinquish_default=val            # ✨ makes BO commandable
+                        )
+    obj.add_objects_to_application(app)
+    return obj.objects[name]
+
+def add_bv(app, inst, name, val=False, desc=""):
+    obj = binary_value(instance=inst, name=name,
+                       description=desc or name,
+                       presentValue=val,
+                       relinquish_default=val            # commandable
+                       )
+    obj.add_objects_to_application(app)
+    return obj.objects[name]
+
+def add_mi(app, inst, name, states, val=1, desc=""):
+    obj = multistate_input(instance=inst, name=name,
+                           numberOfStates=len(states),
+                           description=desc or name,
+                           stateText=states,
+                           presentValue=val)
+    obj.add_objects_to_application(app)
+    return obj.objects[name]
+
+def add_mo(app, inst, name, states, val=1, desc=""):
+    obj = multistate_output(instance=inst, name=name,
+                            numberOfStates=len(states),
+                            description=desc or name,
+                            stateText=states,
+                            presentValue=val,
+                            relinquish_default=val         # commandable
+                            )
+    obj.add_objects_to_application(app)
+    return obj.objects[name]
+
+def add_mv(app, inst, name, states, val=1, desc=""):
+    obj = multistate_value(instance=inst, name=name,
+                           numberOfStates=len(states),
+                           description=desc or name,
+                           stateText=states,
+                           presentValue=val,
+                           relinquish_default=val          # commandable MV
+                           )
+    obj.add_objects_to_application(app)
+    return obj.objects[name]
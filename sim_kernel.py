@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Numeric simulation kernel for the virtual BACnet device
+=======================================================
+
+The per-tick math from ``virtual_device`` — sine bases, random walks,
+clamps and deadband masking — extracted into a single function over the
+struct-of-arrays tables so numba can compile it when available. Pure
+typed-array arithmetic, no BAC0 objects, no allocation beyond the
+returned mask.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:                       # numba is optional
+    njit = None
+
+# Category codes for the struct-of-arrays simulation tables
+CAT_TEMP, CAT_HUMID, CAT_FLOW, CAT_PRESS, CAT_MULTI, CAT_BINARY, CAT_SKIP = range(7)
+
+# Writeback deadbands per analog category — skip the BACnet write (and any
+# COV traffic it triggers) when the change would not be visible anyway
+DB_TEMP, DB_HUMID, DB_FLOW, DB_PRESS = 0.05, 0.5, 1.0, 0.02
+
+
+def step(analog_idx, cat_codes, allowed, values, last_written,
+         temp_base, flow_base, noise):
+    """Advance the analog points one tick, in place on ``values``.
+
+    ``analog_idx`` lists the indices of temperature/humidity/flow/pressure
+    points, so the loop is O(simulated points) rather than O(all objects).
+    ``noise`` holds one uniform(-1, 1) draw per entry of ``analog_idx``;
+    each category scales it to its own range inside the loop. Returns a
+    boolean mask (full-length) of the points whose new value cleared the
+    writeback deadband (``last_written`` is updated for exactly those).
+    """
+    changed = np.zeros(values.shape[0], dtype=np.bool_)
+
+    for k in range(analog_idx.shape[0]):
+        i = analog_idx[k]
+        if not allowed[i]:
+            continue
+        c = cat_codes[i]
+
+        if c == CAT_TEMP:
+            # temperature sine wave with small random variation
+            v = temp_base + noise[k]
+            db = DB_TEMP
+        elif c == CAT_HUMID:
+            # humidity random walk, clamped to 20..80 %RH
+            v = values[i] + noise[k] * 0.5
+            v = 20.0 if v < 20.0 else (80.0 if v > 80.0 else v)
+            db = DB_HUMID
+        elif c == CAT_FLOW:
+            # airflow with some variation, never negative
+            v = flow_base + noise[k] * 10.0
+            if v < 0.0:
+                v = 0.0
+            db = DB_FLOW
+        elif c == CAT_PRESS:
+            # pressure random walk, never negative
+            v = values[i] + noise[k] * 0.1
+            if v < 0.0:
+                v = 0.0
+            db = DB_PRESS
+        else:
+            continue                      # multistate/binary handled outside
+
+        values[i] = v
+        d = v - last_written[i]
+        if (d if d >= 0.0 else -d) > db:
+            last_written[i] = v
+            changed[i] = True
+
+    return changed
+
+
+if njit is not None:
+    step = njit(cache=True, fastmath=True)(step)
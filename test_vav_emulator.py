@@ -27,18 +27,16 @@ async def test_simulator():
     print("Enhanced Virtual VAV BACnet Device Simulator Test")
     print("="*60)
     
-    # Check if required files exist
+    # Check if required files exist (single pass over both paths)
     config_file = Path("vav.ini")
     points_file = Path("points.csv")
-    
-    if not config_file.exists():
-        print(f"❌ Configuration file not found: {config_file}")
-        return False
-        
-    if not points_file.exists():
-        print(f"❌ Points file not found: {points_file}")
+
+    missing = [p for p in (config_file, points_file) if not p.exists()]
+    if missing:
+        for path in missing:
+            print(f"❌ Required file not found: {path}")
         return False
-    
+
     print(f"✓ Configuration file found: {config_file}")
     print(f"✓ Points file found: {points_file}")
     
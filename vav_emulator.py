@@ -1,18 +1,12 @@
 import argparse
 import asyncio
-import math
-import random
 import time
 
+import numpy as np
+
 # python vav_emulator.py -a 192.168.68.105/24 --port 47809
 
 import BAC0
-from BAC0.core.devices.local.factory import (
-    analog_input, analog_output,
-    binary_output,
-    multistate_input, multistate_output, multistate_value
-)
-
 # ──────────────── CLI ────────────────────────────────────────────────────────
 p = argparse.ArgumentParser(
     formatter_class=argparse.ArgumentDefaultsHelpFormatter,
@@ -25,59 +19,92 @@ p.add_argument("-s", "--step", type=float, default=0.5, help="Simulation step (s
 args = p.parse_args()
 
 # ──────────────── Point-helper functions ─────────────────────────────────────
-def add_ai(app, inst, name, units, val=0, desc=""):
-    analog_input(instance=inst, name=name,
-                 properties={"units": units},
-                 description=desc or name,
-                 presentValue=val
-                 ).add_objects_to_application(app)
-    return app[name]
-
-def add_ao(app, inst, name, units, val=0, desc=""):
-    analog_output(instance=inst, name=name,
-                  properties={"units": units},
-                  description=desc or name,
-                  presentValue=val,
-                  relinquish_default=val            # commandable
-                  ).add_objects_to_application(app)
-    return app[name]
-
-def add_bo(app, inst, name, val=False, desc=""):
-    binary_output(instance=inst, name=name,
-                  description=desc or name,
-                  presentValue=val,
-                  relinquish_default=val            # ✨ makes BO commandable
-                  ).add_objects_to_application(app)
-    return app[name]
-
-def add_mi(app, inst, name, states, val=1, desc=""):
-    multistate_input(instance=inst, name=name,
-                     numberOfStates=len(states),
-                     description=desc or name,
-                     stateText=states,
-                     presentValue=val
-                     ).add_objects_to_application(app)
-    return app[name]
-
-def add_mo(app, inst, name, states, val=1, desc=""):
-    multistate_output(instance=inst, name=name,
-                      numberOfStates=len(states),
-                      description=desc or name,
-                      stateText=states,
-                      presentValue=val,
-                      relinquish_default=val          # commandable
-                      ).add_objects_to_application(app)
-    return app[name]
-
-def add_mv(app, inst, name, states, val=1, desc=""):
-    multistate_value(instance=inst, name=name,
-                     numberOfStates=len(states),
-                     description=desc or name,
-                     stateText=states,
-                     presentValue=val,
-                     relinquish_default=val          # commandable MV
-                     ).add_objects_to_application(app)
-    return app[name]
+# Shared with virtual_device and virtual_vav_device — see point_helpers.py
+from point_helpers import add_ai, add_ao, add_bo, add_mi, add_mo, add_mv
+
+# ──────────────── Simulation state vector ────────────────────────────────────
+# All continuously-simulated values live in one float64 array; the names
+# below are the slot indices. Physics runs on the array (a handful of
+# C-level ops per tick) and the results are pushed to the BACnet objects
+# in a single writeback pass.
+(DAMPER, REHEAT, DAMPER_HOT, DAMPER_COLD,
+ AIRFLOW, AIRFLOW_HOT, AIRFLOW_COLD,
+ DISCHARGE_T, INLET_T, SPACE_T, SPACE_SP,
+ HUMIDITY, OUTDOOR_T, MAX_FLOW) = range(14)
+STATE_SLOTS = 14
+
+# ──────────────── Simulation constants ───────────────────────────────────────
+BAND, GAIN, ROOM_G = 0.5, 4.0, 0.04
+COOL, HEAT = 12.0, 30.0
+
+OUTDOOR_CYCLE_S     = 20 * 60          # 20-min “day”
+FAULT_MEAN_S        = 120              # avg 2-min between brief faults
+MAX_FLOW_REFRESH_S  = 3600             # 1-hr max-airflow update
+
+# numba is optional — when installed the physics kernel below is compiled
+# to native code (cached across runs); otherwise it runs as plain Python
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# Batched RNG: draw noise in blocks from numpy's PCG64 generator instead of
+# going through the Python-level Mersenne Twister wrapper every tick
+_rng = np.random.default_rng()
+_NOISE_BATCH = 4096
+_FAULT_BATCH = 64
+
+# Outdoor-temperature lookup table: one entry per simulation step across a
+# full cycle, so the per-tick transcendental becomes a modulo + index
+_SIN_STEPS = max(1, int(OUTDOOR_CYCLE_S / args.step))
+_SIN_LUT = 21 + 6 * np.sin(2 * np.pi * np.arange(_SIN_STEPS) / _SIN_STEPS)
+
+
+def _step(state, humidity_noise):
+    """Advance the physics one tick, in place on the state vector
+
+    Pure scalar float math on a fixed-layout array — no BAC0 objects, no
+    allocation — so numba can compile it to a single native function.
+    """
+    # simple PI-ish loop on space temp
+    err = state[SPACE_SP] - state[SPACE_T]
+
+    if err < -BAND:                      # too cold – open damper
+        state[DAMPER] = min(100.0, state[DAMPER] + (-err) * GAIN)
+        state[REHEAT] = 0.0
+    elif err > BAND:                     # too hot – reheat
+        state[DAMPER] = max(0.0, state[DAMPER] - err * GAIN)
+        state[REHEAT] = min(100.0, err * GAIN * 2)
+    else:                                # within band – relax to 30 %
+        state[REHEAT] = 0.0
+        state[DAMPER] += (30.0 - state[DAMPER]) * 0.1
+
+    # clamp range
+    state[DAMPER] = min(100.0, max(0.0, state[DAMPER]))
+
+    # derive deck dampers + airflows
+    state[DAMPER_HOT] = state[REHEAT]
+    state[DAMPER_COLD] = state[DAMPER]
+    state[AIRFLOW] = state[DAMPER] * 1.2
+    state[AIRFLOW_HOT] = state[DAMPER_HOT] * 1.0
+    state[AIRFLOW_COLD] = state[DAMPER_COLD] * 1.0
+
+    # temperatures
+    r_frac = state[REHEAT] * 0.01
+    state[DISCHARGE_T] = COOL * (1.0 - r_frac) + HEAT * r_frac
+    state[INLET_T] += (state[DISCHARGE_T] - state[INLET_T]) * 0.05
+
+    # room thermal response
+    state[SPACE_T] += ((state[DISCHARGE_T] - state[SPACE_T]) *
+                       (state[AIRFLOW] / 120) * ROOM_G)
+
+    # humidity random walk
+    state[HUMIDITY] = max(25.0, min(75.0, state[HUMIDITY] + humidity_noise))
+
+
+if njit is not None:
+    _step = njit(cache=True, fastmath=True)(_step)
 
 # ──────────────── Main async task ────────────────────────────────────────────
 async def main():
@@ -113,87 +140,104 @@ async def main():
     print(f"✔ Virtual VAV device {args.deviceId} on "
           f"{args.address.split('/')[0]}:{args.port}")
 
-    # ---------------- Simulation constants -----------------------------------
     STEP = args.step
-    BAND, GAIN, ROOM_G = 0.5, 4.0, 0.04
-    COOL, HEAT = 12.0, 30.0
-
-    OUTDOOR_CYCLE_S     = 20 * 60          # 20-min “day”
-    FAULT_MEAN_S        = 120              # avg 2-min between brief faults
-    MAX_FLOW_REFRESH_S  = 3600             # 1-hr max-airflow update
-    next_fault = time.time() + random.expovariate(1 / FAULT_MEAN_S)
-    next_max   = time.time() + MAX_FLOW_REFRESH_S
+
+    # pre-drawn random batches, refilled when exhausted
+    humidity_noise = _rng.uniform(-0.2, 0.2, size=_NOISE_BATCH)
+    noise_i = 0
+    fault_gaps = _rng.exponential(FAULT_MEAN_S, size=_FAULT_BATCH)
+    fault_i = 0
+
+    # all tick timing uses the monotonic clock: immune to wall-clock jumps
+    # and cheaper than time.time() on platforms where the latter syscalls
+    start = time.monotonic()
+    next_fault = start + fault_gaps[fault_i]
+    fault_i += 1
+    next_max   = start + MAX_FLOW_REFRESH_S
     last_occ   = occupied_cmd.presentValue
 
-    # ---------------- Main simulation loop -----------------------------------
-    while True:
-        # ---------- simple PI-ish loop on space temp ------------------------
-        sp   = space_setpoint.presentValue
-        t    = space_temp.presentValue
-        err  = sp - t
-
-        if err < -BAND:                      # too cold – open damper
-            damper.presentValue = min(100, damper.presentValue + (-err) * GAIN)
-            reheat.presentValue = 0
-        elif err > BAND:                     # too hot – reheat
-            damper.presentValue = max(0, damper.presentValue - err * GAIN)
-            reheat.presentValue = min(100, err * GAIN * 2)
-        else:                                # within band – relax to 30 %
-            reheat.presentValue = 0
-            damper.presentValue += (30 - damper.presentValue) * 0.1
-
-        # clamp range
-        damper.presentValue = max(0, min(100, damper.presentValue))
-
-        # derive deck dampers + airflows
-        damper_hot.presentValue   = reheat.presentValue
-        damper_cold.presentValue  = damper.presentValue
-        airflow.presentValue      = damper.presentValue * 1.2
-        airflow_hot.presentValue  = damper_hot.presentValue * 1.0
-        airflow_cold.presentValue = damper_cold.presentValue * 1.0
-
-        # temperatures
-        discharge_temp.presentValue = (
-            COOL * (1 - reheat.presentValue / 100) +
-            HEAT * (reheat.presentValue / 100)
-        )
-        inlet_temp.presentValue += (
-            discharge_temp.presentValue - inlet_temp.presentValue) * 0.05
-
-        # room thermal response
-        t += ((discharge_temp.presentValue - t) *
-              (airflow.presentValue / 120) * ROOM_G)
-        space_temp.presentValue = t
-
-        # ---------- environment / randomness --------------------------------
-        now = time.time()
-
-        # outdoor temp sine wave
-        outdoor_temp.presentValue = 21 + 6 * math.sin(2 * math.pi * now / OUTDOOR_CYCLE_S)
-
-        # humidity random walk
-        humidity.presentValue = max(
-            25, min(75, humidity.presentValue + random.uniform(-0.2, 0.2))
-        )
-
-        # occasional fault blip
-        if now >= next_fault:
-            op_status.presentValue = 4          # Fault
-            await asyncio.sleep(5)
-            op_status.presentValue = 1          # Cooling
-            next_fault = now + random.expovariate(1 / FAULT_MEAN_S)
-
-        # refresh max airflow hourly
-        if now >= next_max:
-            max_airflow.presentValue = random.uniform(350, 450)
-            next_max = now + MAX_FLOW_REFRESH_S
-
-        # tweak setpoint on occupancy toggle
-        if occupied_cmd.presentValue != last_occ:
-            space_setpoint.presentValue += 0.1 if occupied_cmd.presentValue else -0.1
-            last_occ = occupied_cmd.presentValue
-
-        await asyncio.sleep(STEP)
+    # state vector + (object, slot) bindings, seeded from the initial values
+    state = np.zeros(STATE_SLOTS)
+    bindings = [
+        (damper, DAMPER), (damper_hot, DAMPER_HOT), (damper_cold, DAMPER_COLD),
+        (reheat, REHEAT), (airflow, AIRFLOW), (airflow_hot, AIRFLOW_HOT),
+        (airflow_cold, AIRFLOW_COLD), (discharge_temp, DISCHARGE_T),
+        (inlet_temp, INLET_T), (space_temp, SPACE_T),
+        (space_setpoint, SPACE_SP), (humidity, HUMIDITY),
+        (outdoor_temp, OUTDOOR_T), (max_airflow, MAX_FLOW),
+    ]
+    for obj, slot in bindings:
+        state[slot] = float(obj.presentValue)
+
+    # ---------------- Simulation tick, driven by the loop's timer heap ------
+    loop = asyncio.get_running_loop()
+    deadline = loop.time()
+
+    def clear_fault():
+        op_status.presentValue = 1          # back to Cooling
+
+    def tick():
+        nonlocal humidity_noise, noise_i, fault_gaps, fault_i
+        nonlocal next_fault, next_max, last_occ, deadline
+
+        # try/finally so a refused property read/write can't end the timer
+        # chain and leave the device online serving frozen values; the
+        # exception still reaches the loop's exception handler
+        try:
+            # ---------- read phase ------------------------------------------
+            # one property get per client-writable point; everything after
+            # this works on the state vector and locals only
+            state[DAMPER] = float(damper.presentValue)
+            state[REHEAT] = float(reheat.presentValue)
+            occ = occupied_cmd.presentValue
+
+            # ---------- physics step (compiled when numba is present) -------
+            now = time.monotonic()
+            if noise_i == _NOISE_BATCH:
+                humidity_noise = _rng.uniform(-0.2, 0.2, size=_NOISE_BATCH)
+                noise_i = 0
+            _step(state, humidity_noise[noise_i])
+            noise_i += 1
+
+            # outdoor temp sine wave, via the precomputed lookup table
+            state[OUTDOOR_T] = _SIN_LUT[int(now / STEP) % _SIN_STEPS]
+
+            # ---------- low-rate events --------------------------------------
+            # occasional fault blip — cleared by a timer instead of a blocking
+            # sleep, so the rest of the simulation keeps running during the blip
+            if now >= next_fault:
+                op_status.presentValue = 4      # Fault
+                loop.call_later(5, clear_fault)
+                if fault_i == _FAULT_BATCH:
+                    fault_gaps = _rng.exponential(FAULT_MEAN_S, size=_FAULT_BATCH)
+                    fault_i = 0
+                next_fault = now + fault_gaps[fault_i]
+                fault_i += 1
+
+            # refresh max airflow hourly
+            if now >= next_max:
+                state[MAX_FLOW] = _rng.uniform(350, 450)
+                next_max = now + MAX_FLOW_REFRESH_S
+
+            # tweak setpoint on occupancy toggle
+            if occ != last_occ:
+                state[SPACE_SP] += 0.1 if occ else -0.1
+                last_occ = occ
+
+            # ---------- commit phase: one writeback pass to the objects -----
+            for obj, slot in bindings:
+                obj.presentValue = float(state[slot])
+
+        finally:
+            # reschedule against an absolute deadline so per-tick cost doesn't
+            # accumulate into drift; resync rather than burst if we fell behind
+            deadline += STEP
+            if deadline <= loop.time():
+                deadline = loop.time() + STEP
+            loop.call_at(deadline, tick)
+
+    tick()
+    await asyncio.Event().wait()            # run until cancelled
 
 # ─────────────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
@@ -23,44 +23,52 @@ import configparser
 import csv
 import logging
 import math
-import random
+import os
+import pickle
+import re
 import socket
 import sys
 import time
+
+import numpy as np
+
+from sim_kernel import (
+    CAT_TEMP, CAT_HUMID, CAT_FLOW, CAT_PRESS, CAT_MULTI, CAT_BINARY, CAT_SKIP,
+    step as kernel_step,
+)
 from pathlib import Path
 from contextlib import redirect_stderr, redirect_stdout
-from io import StringIO
 import warnings
 
-# Completely suppress all logging and warnings BEFORE importing BAC0
+# Suppress warnings and silence the BACnet stack loggers BEFORE importing
+# BAC0. The per-logger levels let isEnabledFor() short-circuit before any
+# record is built or %-formatted, but BAC0 also creates factory loggers
+# lazily (with their own stream handlers) after this runs, so the global
+# gate stays as well — manager.disable is checked first in isEnabledFor(),
+# covering late arrivals at the same zero cost. This script prints through
+# safe_print, not logging, so the global gate costs it nothing.
 warnings.filterwarnings("ignore")
 logging.disable(logging.CRITICAL)
-
-# Set root logger to suppress everything
-root_logger = logging.getLogger()
-root_logger.disabled = True
+for _name in ('BAC0', 'BAC0_Root', 'bacpypes', 'bacpypes3'):
+    _logger = logging.getLogger(_name)
+    _logger.setLevel(logging.CRITICAL + 1)
+    _logger.propagate = False
 
 import BAC0
 
 # Silence BAC0 immediately after import
 BAC0.log_level('silence')
 
+# Strips emoji/non-ASCII for consoles that cannot encode them
+_NONASCII_RE = re.compile(r'[^\x00-\x7F]+')
+
 # Helper function for safe emoji printing
 def safe_print(message):
     """Print message with emoji fallback for encoding issues"""
     try:
         print(message)
     except UnicodeEncodeError:
-        # Remove emoji characters for ASCII-only consoles
-        import re
-        ascii_message = re.sub(r'[^\x00-\x7F]+', '', message)
-        print(ascii_message.strip())
-
-from BAC0.core.devices.local.factory import (
-    analog_input, analog_output, analog_value,
-    binary_input, binary_output, binary_value,
-    multistate_input, multistate_output, multistate_value
-)
+        print(_NONASCII_RE.sub('', message).strip())
 
 # ──────────────── CLI ────────────────────────────────────────────────────────
 p = argparse.ArgumentParser(
@@ -70,88 +78,18 @@ p = argparse.ArgumentParser(
 p.add_argument("-a", "--address", help="e.g. 192.168.88.10/24 (overrides config)")
 p.add_argument("--port", type=int, help="UDP port (overrides config)")
 p.add_argument("-d", "--deviceId", type=int, help="Device-instance (overrides config)")
-p.add_argument("-c", "--config", default="virtual_device.ini", help="Configuration file")
+p.add_argument("-c", "--config", default="virtual_device.ini",
+               help="Configuration file ('-' reads INI text from stdin)")
 p.add_argument("-p", "--points", help="Points CSV file (overrides config)")
 args = p.parse_args()
 
 # ──────────────── Point-helper functions (same as original) ──────────────────
-def add_ai(app, inst, name, units, val=0, desc=""):
-    analog_input(instance=inst, name=name,
-                 properties={"units": units},
-                 description=desc or name,
-                 presentValue=val
-                 ).add_objects_to_application(app)
-    return app[name]
-
-def add_ao(app, inst, name, units, val=0, desc=""):
-    analog_output(instance=inst, name=name,
-                  properties={"units": units},
-                  description=desc or name,
-                  presentValue=val,
-                  relinquish_default=val            # commandable
-                  ).add_objects_to_application(app)
-    return app[name]
-
-def add_av(app, inst, name, units, val=0, desc=""):
-    analog_value(instance=inst, name=name,
-                 properties={"units": units},
-                 description=desc or name,
-                 presentValue=val,
-                 relinquish_default=val            # commandable
-                 ).add_objects_to_application(app)
-    return app[name]
-
-def add_bi(app, inst, name, val=False, desc=""):
-    binary_input(instance=inst, name=name,
-                 description=desc or name,
-                 presentValue=val
-                 ).add_objects_to_application(app)
-    return app[name]
-
-def add_bo(app, inst, name, val=False, desc=""):
-    binary_output(instance=inst, name=name,
-                  description=desc or name,
-                  presentValue=val,
-                  relinquish_default=val            # ✨ makes BO commandable
-                  ).add_objects_to_application(app)
-    return app[name]
-
-def add_bv(app, inst, name, val=False, desc=""):
-    binary_value(instance=inst, name=name,
-                 description=desc or name,
-                 presentValue=val,
-                 relinquish_default=val            # commandable
-                 ).add_objects_to_application(app)
-    return app[name]
-
-def add_mi(app, inst, name, states, val=1, desc=""):
-    multistate_input(instance=inst, name=name,
-                     numberOfStates=len(states),
-                     description=desc or name,
-                     stateText=states,
-                     presentValue=val
-                     ).add_objects_to_application(app)
-    return app[name]
-
-def add_mo(app, inst, name, states, val=1, desc=""):
-    multistate_output(instance=inst, name=name,
-                      numberOfStates=len(states),
-                      description=desc or name,
-                      stateText=states,
-                      presentValue=val,
-                      relinquish_default=val         # commandable
-                      ).add_objects_to_application(app)
-    return app[name]
-
-def add_mv(app, inst, name, states, val=1, desc=""):
-    multistate_value(instance=inst, name=name,
-                     numberOfStates=len(states),
-                     description=desc or name,
-                     stateText=states,
-                     presentValue=val,
-                     relinquish_default=val          # commandable MV
-                     ).add_objects_to_application(app)
-    return app[name]
+# Shared with vav_emulator and virtual_vav_device — see point_helpers.py
+from point_helpers import (
+    add_ai, add_ao, add_av,
+    add_bi, add_bo, add_bv,
+    add_mi, add_mo, add_mv
+)
 
 # ──────────────── Auto IP Detection Function ────────────────────────────────
 def get_local_ip():
@@ -166,143 +104,322 @@ def get_local_ip():
         # Fallback to localhost if auto-detection fails
         return "127.0.0.1/32"
 
+# ──────────────── Simulation classification ─────────────────────────────────
+# Category codes and writeback deadbands live in sim_kernel alongside the
+# numeric step function that consumes them.
+
+def classify_point(name, obj_type):
+    """Pick a simulation category from the object's name/type (done once)"""
+    if 'Temperature' in name:
+        return CAT_TEMP
+    if 'Humidity' in name:
+        return CAT_HUMID
+    if 'Airflow' in name or 'Flow' in name:
+        return CAT_FLOW
+    if 'Pressure' in name:
+        return CAT_PRESS
+    if 'multistate' in obj_type:
+        return CAT_MULTI
+    if 'binary' in obj_type:
+        return CAT_BINARY
+    return CAT_SKIP
+
+def build_sim_tables(objects):
+    """Classify every object once into struct-of-arrays simulation tables.
+
+    Names and types are immutable, so all the substring scans and
+    ``type(obj).__name__`` lookups happen here instead of per tick. Returns
+    parallel arrays: object refs, category codes (int8), shadow values
+    (float64), plus input/commandable masks.
+    """
+    obj_refs = []
+    cats = []
+    vals = []
+    inputs = []
+    commandable = []
+    nstates = []
+
+    for name, obj in objects.items():
+        if not hasattr(obj, 'presentValue'):
+            continue
+        obj_type = str(type(obj).__name__).lower()
+        obj_refs.append(obj)
+        cats.append(classify_point(name, obj_type))
+        try:
+            vals.append(float(obj.presentValue))
+        except (TypeError, ValueError):
+            vals.append(0.0)  # binary/multistate shadow slot is unused
+        inputs.append('input' in obj_type)
+        commandable.append('output' in obj_type or 'value' in obj_type)
+        # capability probes happen here, once, not per tick
+        nstates.append(getattr(obj, 'numberOfStates', 4) or 4)
+
+    return (obj_refs,
+            np.array(cats, dtype=np.int8),
+            np.array(vals, dtype=np.float64),
+            np.array(inputs, dtype=bool),
+            np.array(commandable, dtype=bool),
+            np.array(nstates, dtype=np.int32))
+
+# ──────────────── Write-event hook ───────────────────────────────────────────
+def install_write_event_hook(app, event, on_write=None):
+    """Fire *event* whenever a BACnet client writes a property to this device.
+
+    Wraps the bacpypes3 application's WriteProperty and
+    WritePropertyMultiple handlers so commandable values propagate through
+    the simulation immediately instead of waiting for the next periodic
+    scan. ``on_write`` (if given) is called once per written object with
+    something carrying its ``objectIdentifier`` (the request APDU, or each
+    write-access spec of a WritePropertyMultiple), letting callers refresh
+    cached per-object state. Returns True if the hook could be installed.
+    """
+    try:
+        target = app.this_application.app
+        original = target.do_WritePropertyRequest
+    except AttributeError:
+        return False
+
+    def notify(item):
+        if on_write is not None:
+            try:
+                on_write(item)
+            except Exception:
+                pass
+
+    async def do_WritePropertyRequest(apdu):
+        await original(apdu)
+        notify(apdu)
+        event.set()
+
+    target.do_WritePropertyRequest = do_WritePropertyRequest
+
+    # WritePropertyMultiple lands through a separate handler; without this
+    # wrap a WPM client write would never refresh the priority cache
+    original_wpm = getattr(target, 'do_WritePropertyMultipleRequest', None)
+    if original_wpm is not None:
+        async def do_WritePropertyMultipleRequest(apdu):
+            await original_wpm(apdu)
+            for spec in getattr(apdu, 'listOfWriteAccessSpecs', None) or ():
+                notify(spec)
+            event.set()
+
+        target.do_WritePropertyMultipleRequest = do_WritePropertyMultipleRequest
+
+    return True
+
+# First numeric token in a PresentValue string ("100 %", "[4] Cooling", ...)
+_NUM_RE = re.compile(r'[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?')
+
 # ──────────────── CSV Loading Function ───────────────────────────────────────
+def _iter_points_csv(csv_file: str):
+    """Yield point definitions from a CSV file one row at a time.
+
+    Generator pipeline: rows stream straight into object creation without
+    materializing the whole file in memory. csv.reader with column indices
+    resolved once avoids DictReader's per-row dict allocation and key
+    hashing. Yields (type, instance, name, present_value, description).
+    Short rows (or a missing header column) yield None for the absent
+    required fields — DictReader's fill value — so the per-row guard in
+    create_objects_from_csv records just that row as failed instead of
+    the rest of the file being dropped. Open/read errors propagate to the
+    caller.
+    """
+    with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+
+        col_idx = {col: i for i, col in enumerate(header)}
+        i_type = col_idx.get('Type')
+        i_inst = col_idx.get('Instance')
+        i_name = col_idx.get('Name')
+        i_pv = col_idx.get('PresentValue')
+        i_desc = col_idx.get('Description')
+
+        count = 0
+        for row in reader:
+            if not row:
+                continue
+            n = len(row)
+            yield (row[i_type] if i_type is not None and i_type < n else None,
+                   row[i_inst] if i_inst is not None and i_inst < n else None,
+                   row[i_name] if i_name is not None and i_name < n else None,
+                   row[i_pv] if i_pv is not None and i_pv < n else '0',
+                   row[i_desc] if i_desc is not None and i_desc < n else '')
+            count += 1
+
+    safe_print(f"✔ Loaded {count} points from {csv_file}")
+
 def load_points_from_csv(csv_file: str):
-    """Load point definitions from CSV file"""
-    points = []
-    
-    if not Path(csv_file).exists():
+    """Load point definitions, with a pickle cache keyed on the CSV's mtime.
+
+    On a cache hit the parsed rows come straight from ``<csv>.cache.pkl``
+    (protocol 5), skipping the CSV parse on restart. On a miss the rows
+    still stream lazily into object creation; the cache is written only
+    once the parse completes cleanly, so a parse that aborts mid-file is
+    never replayed as a valid point list. The cache is best-effort: any
+    problem reading or writing it just falls back to plain parsing.
+    """
+    src = Path(csv_file)
+    if not src.exists():
         safe_print(f"⚠ CSV file {csv_file} not found - creating minimal test device")
-        return points
-    
+        return []
+
+    cache_path = src.with_suffix('.cache.pkl')
     try:
-        with open(csv_file, 'r', newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                points.append(row)
-        
-        safe_print(f"✔ Loaded {len(points)} points from {csv_file}")
-        return points
-        
-    except Exception as e:
-        safe_print(f"✗ Error loading CSV: {e}")
-        return points
+        if cache_path.stat().st_mtime >= src.stat().st_mtime:
+            with open(cache_path, 'rb') as f:
+                points = pickle.load(f)
+            safe_print(f"✔ Loaded {len(points)} points from {csv_file} (cached)")
+            return points
+    except (OSError, pickle.PickleError, EOFError, AttributeError):
+        pass  # missing or unreadable cache - reparse below
+
+    def parse_and_cache():
+        rows = []
+        try:
+            for row in _iter_points_csv(csv_file):
+                rows.append(row)
+                yield row
+        except Exception as e:
+            # Aborted parse: leave no cache behind, otherwise the truncated
+            # prefix would be served as a clean hit on every restart
+            safe_print(f"✗ Error loading CSV: {e}")
+            return
+        try:
+            with open(cache_path, 'wb') as f:
+                pickle.dump(rows, f, protocol=5)
+        except OSError:
+            pass
+
+    return parse_and_cache()
+
+# All 21 states of the 20-character progress bar, built once
+_BARS = ["=" * i + "-" * (20 - i) for i in range(21)]
+
+# Object type mapping, keyed by the CSV spellings and (below) by their
+# normalized lowercase/no-space forms so one dict hit covers most variants
+OBJECT_TYPE_MAP = {
+    'Analog Input': 'analogInput',
+    'Analog Output': 'analogOutput',
+    'Analog Value': 'analogValue',
+    'Binary Input': 'binaryInput',
+    'Binary Output': 'binaryOutput',
+    'Binary Value': 'binaryValue',
+    'Multi State Input': 'multistateInput',
+    'Multi State Output': 'multistateOutput',
+    'Multi State Value': 'multistateValue',
+    'Multistate Input': 'multistateInput',
+    'Multistate Output': 'multistateOutput',
+    'Multistate Value': 'multistateValue',
+}
+OBJECT_TYPE_MAP.update({
+    k.lower().replace(' ', ''): v for k, v in list(OBJECT_TYPE_MAP.items())
+})
+
+# Default state names shared by every multistate object (allocated once)
+_DEFAULT_STATES = ("State1", "State2", "State3", "State4")
+
+# Creation dispatch: one dict hit instead of a nine-way elif ladder.
+# The kind selects the helper signature (units vs. states) and the
+# initial-value coercion.
+_CREATE_DISPATCH = {
+    'analogInput': (add_ai, 'analog'),
+    'analogOutput': (add_ao, 'analog'),
+    'analogValue': (add_av, 'analog'),
+    'binaryInput': (add_bi, 'binary'),
+    'binaryOutput': (add_bo, 'binary'),
+    'binaryValue': (add_bv, 'binary'),
+    'multistateInput': (add_mi, 'multistate'),
+    'multistateOutput': (add_mo, 'multistate'),
+    'multistateValue': (add_mv, 'multistate'),
+}
 
 # ──────────────── Object Creation from CSV ──────────────────────────────────
 def create_objects_from_csv(app, points):
-    """Create BACnet objects from CSV point definitions"""
+    """Create BACnet objects from CSV point definitions.
+
+    ``points`` is any iterable of (type, instance, name, present_value,
+    description) tuples; a generator streams rows without buffering them.
+    """
     created_objects = {}
-    total_points = len(points)
+    name_counts = {}  # occurrences per original name, for O(1) dedup
+    # Generators have no len(); the progress display degrades gracefully
+    total_points = len(points) if hasattr(points, '__len__') else None
     failed_count = 0
     failed_objects = []  # Track failed objects for detailed reporting
-    
+
     if total_points == 0:
         return created_objects
+
+    if total_points is not None:
+        safe_print(f"🔧 Creating {total_points} BACnet objects...")
+    else:
+        safe_print("🔧 Creating BACnet objects...")
     
-    safe_print(f"🔧 Creating {total_points} BACnet objects...")
-    
-    # Object type mapping
-    object_type_map = {
-        'Analog Input': 'analogInput',
-        'Analog Output': 'analogOutput', 
-        'Analog Value': 'analogValue',
-        'Binary Input': 'binaryInput',
-        'Binary Output': 'binaryOutput',
-        'Binary Value': 'binaryValue',
-        'Multi State Input': 'multistateInput',
-        'Multi State Output': 'multistateOutput',
-        'Multi State Value': 'multistateValue',
-        # Handle various case versions from CSV
-        'Multistate Input': 'multistateInput',
-        'Multistate Output': 'multistateOutput',
-        'Multistate Value': 'multistateValue',
-        'multistateinput': 'multistateInput',
-        'multistateoutput': 'multistateOutput',
-        'multistatevalue': 'multistateValue'
-    }
-    
+    _otm_get = OBJECT_TYPE_MAP.get
+
+    # Log on ~5% increments (every 50 rows when the total is unknown) so a
+    # large CSV doesn't spend its load time on stdout roundtrips
+    progress_every = max(1, total_points // 20) if total_points else 50
+
     for i, point in enumerate(points):
         try:
-            # Show progress every 10 objects
-            if i % 10 == 0 or i == total_points - 1:
-                progress = int((i + 1) / total_points * 20)  # 20 character progress bar
-                bar = "=" * progress + "-" * (20 - progress)  # Use ASCII chars for compatibility
-                percent = int((i + 1) / total_points * 100)
+            if i % progress_every == 0 or (total_points is not None and i == total_points - 1):
+                if total_points is not None:
+                    progress = int((i + 1) / total_points * 20)  # 20 character progress bar
+                    bar = _BARS[progress]  # ASCII chars for compatibility
+                    percent = int((i + 1) / total_points * 100)
+                    line = f"Creating objects... [{bar}] {percent}% ({i+1}/{total_points})"
+                else:
+                    line = f"Creating objects... ({i+1} so far)"
                 # For subprocess compatibility, use newlines instead of carriage returns
                 if sys.stdout.isatty():
                     # Terminal output - use carriage return
                     try:
-                        print(f"\r🔧 Creating objects... [{bar}] {percent}% ({i+1}/{total_points})", end="", flush=True)
+                        print(f"\r🔧 {line}", end="", flush=True)
                     except UnicodeEncodeError:
-                        print(f"\rCreating objects... [{bar}] {percent}% ({i+1}/{total_points})", end="", flush=True)
+                        print(f"\r{line}", end="", flush=True)
                 else:
                     # Subprocess output - use newlines for proper buffering
-                    safe_print(f"Creating objects... [{bar}] {percent}% ({i+1}/{total_points})")
-            
-            object_type = point['Type']
-            instance = int(point['Instance'])
-            name = point['Name']
+                    safe_print(line)
+
+            object_type, instance_str, name, present_value, description = point
+            instance = int(instance_str)
             units = 'noUnits'  # Not in CSV, default value
-            description = point.get('Description', name)
+            description = description or name
             
-            # Handle duplicate names by making them unique
+            # Handle duplicate names by making them unique (counter lookup
+            # instead of rescanning created_objects per candidate)
             original_name = name
-            counter = 1
-            while name in created_objects:
-                name = f"{original_name}_{counter}"
-                counter += 1
+            count = name_counts.get(original_name, 0)
+            if count:
+                name = f"{original_name}_{count}"
+            name_counts[original_name] = count + 1
             
-            # Get initial value with safe conversion
-            try:
-                val_str = point.get('PresentValue', '0').replace(' %', '').replace(' CFM', '').replace(' F', '').replace(' GPM', '').replace(' PSI', '').split()[0]
-                initial_val = float(val_str)
-            except (ValueError, TypeError, IndexError):
-                initial_val = 0.0
+            # Get initial value: one compiled-regex scan instead of five
+            # chained .replace() passes plus a split per row
+            m = _NUM_RE.search(present_value or '')
+            initial_val = float(m.group()) if m else 0.0
             
-            bac_object_type = object_type_map.get(object_type, object_type.lower().replace(' ', ''))
+            bac_object_type = (_otm_get(object_type)
+                               or _otm_get(object_type.lower().replace(' ', ''))
+                               or object_type)
             
             # Create object based on type using the same helper functions
-            if bac_object_type == 'analogInput':
-                obj = add_ai(app, instance, name, units, initial_val, description)
-                created_objects[name] = obj
-                
-            elif bac_object_type == 'analogOutput':
-                obj = add_ao(app, instance, name, units, initial_val, description)
-                created_objects[name] = obj
-                
-            elif bac_object_type == 'analogValue':
-                obj = add_av(app, instance, name, units, initial_val, description)
-                created_objects[name] = obj
-                
-            elif bac_object_type == 'binaryInput':
-                bool_val = bool(initial_val)
-                obj = add_bi(app, instance, name, bool_val, description)
-                created_objects[name] = obj
-                
-            elif bac_object_type == 'binaryOutput':
-                bool_val = bool(initial_val)
-                obj = add_bo(app, instance, name, bool_val, description)
-                created_objects[name] = obj
-                
-            elif bac_object_type == 'binaryValue':
-                bool_val = bool(initial_val)
-                obj = add_bv(app, instance, name, bool_val, description)
+            entry = _CREATE_DISPATCH.get(bac_object_type)
+            if entry is not None:
+                helper, kind = entry
+                if kind == 'analog':
+                    obj = helper(app, instance, name, units, initial_val, description)
+                elif kind == 'binary':
+                    obj = helper(app, instance, name, bool(initial_val), description)
+                else:  # multistate - default states if not specified
+                    obj = helper(app, instance, name, _DEFAULT_STATES,
+                                 max(1, int(initial_val)), description)
                 created_objects[name] = obj
-                
-            elif bac_object_type in ['multistateInput', 'multistateOutput', 'multistateValue']:
-                # Default states if not specified
-                states = ["State1", "State2", "State3", "State4"]
-                int_val = max(1, int(initial_val))
-                
-                if bac_object_type == 'multistateInput':
-                    obj = add_mi(app, instance, name, states, int_val, description)
-                elif bac_object_type == 'multistateOutput':
-                    obj = add_mo(app, instance, name, states, int_val, description)
-                else:  # multistateValue
-                    obj = add_mv(app, instance, name, states, int_val, description)
-                    
-                created_objects[name] = obj
-            
+
             else:
                 failed_count += 1
                 failed_objects.append({
@@ -314,10 +431,11 @@ def create_objects_from_csv(app, points):
                 
         except Exception as e:
             failed_count += 1
+            pt = tuple(point) + ('Unknown',) * 3
             failed_objects.append({
-                'instance': point.get('Instance', 'Unknown'),
-                'name': point.get('Name', 'Unknown'),
-                'type': point.get('Type', 'Unknown'),
+                'instance': pt[1],
+                'name': pt[2],
+                'type': pt[0],
                 'error': str(e)
             })
     
@@ -351,9 +469,13 @@ def create_objects_from_csv(app, points):
 
 # ──────────────── Main async task ────────────────────────────────────────────
 async def main():
-    # Load configuration
-    config = configparser.ConfigParser()
-    config.read(args.config)
+    # Load configuration ('-' lets a parent process pipe the INI in without
+    # leaving a temp file on disk)
+    config = configparser.ConfigParser(interpolation=None)
+    if args.config == "-":
+        config.read_string(sys.stdin.read())
+    else:
+        config.read(args.config)
     
     # Get network settings (command line overrides config file, auto-detect if not specified)
     if args.address:
@@ -379,17 +501,20 @@ async def main():
     else:
         points_file = "points.csv"
     
-    # Create BACnet application (all logging already suppressed)
-    with redirect_stdout(StringIO()), redirect_stderr(StringIO()):
-        app = BAC0.lite(ip=address, port=port, deviceId=device_id)
+    # Create BACnet application; library chatter goes to /dev/null instead
+    # of an unbounded in-memory StringIO buffer
+    with open(os.devnull, 'w') as devnull:
+        with redirect_stdout(devnull), redirect_stderr(devnull):
+            app = BAC0.lite(ip=address, port=port, deviceId=device_id)
     
     # Load and create objects from CSV
     points = load_points_from_csv(points_file)
     
-    # Suppress all warnings during object creation
+    # Suppress all warnings during object creation (stdout stays live for
+    # the progress display)
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
-        with redirect_stderr(StringIO()):
+        with open(os.devnull, 'w') as devnull, redirect_stderr(devnull):
             objects = create_objects_from_csv(app, points)
     
     safe_print(f"✔ Virtual BACnet device {device_id} on {address.split('/')[0]}:{port}")
@@ -400,108 +525,163 @@ async def main():
     # ────────────── Simulation constants ─────────────────────────────────────
     STEP = step
     OUTDOOR_CYCLE_S = config.getint('environment', 'outdoor_temp_cycle_minutes', fallback=20) * 60
+    # Angular frequencies of the environment sine waves, computed once
+    OMEGA_DAY = 2 * math.pi / OUTDOOR_CYCLE_S
+    OMEGA_FLOW = math.pi / OUTDOOR_CYCLE_S
     
+    # ────────────── Simulation tables (classified once, not per tick) ────────
+    (sim_objs, cat_codes, values,
+     is_input, is_commandable, num_states) = build_sim_tables(objects)
+
+    multi_idx = np.nonzero(cat_codes == CAT_MULTI)[0]
+    bin_idx = np.nonzero(cat_codes == CAT_BINARY)[0]
+    cmd_idx = np.nonzero(is_commandable)[0]
+    # Analog points with a simulation rule; the kernel loops over just these
+    analog_idx = np.nonzero(cat_codes <= CAT_PRESS)[0]
+
+    # Mirror of binary states so the flip branch never has to read the
+    # (descriptor-backed) presentValue just to compute its complement
+    binary_state = np.zeros(cat_codes.size, dtype=np.uint8)
+    for i in bin_idx:
+        try:
+            binary_state[i] = 1 if str(sim_objs[i].presentValue) == 'active' else 0
+        except Exception:
+            binary_state[i] = 0
+
+    # Shadow of the last value actually pushed to each object, for
+    # Δ-coalescing: steady-state points skip their writeback entirely
+    last_written = values.copy()
+
+    rng = np.random.default_rng()
+
+    # ────────────── Priority cache (refreshed event-driven) ──────────────────
+    # prio_clear[i] is True when priorities 1-15 are all null, i.e. priority
+    # 16 is active and the simulation may drive the object. Instead of
+    # rescanning every priorityArray per tick, the write hook refreshes just
+    # the object a client wrote to.
+    prio_clear = np.ones(cat_codes.size, dtype=bool)
+    objid_index = {}
+    for i in cmd_idx:
+        try:
+            objid_index[sim_objs[i].objectIdentifier] = i
+        except AttributeError:
+            pass
+
+    def refresh_priority(i):
+        obj = sim_objs[i]
+        try:
+            if hasattr(obj, 'priorityArray'):
+                priority_array = obj.priorityArray
+                # If all higher priorities (1-15) are null, 16 is active
+                prio_clear[i] = not any(
+                    priority_array[j] is not None
+                    for j in range(15)  # priorities 1-15 (0-indexed)
+                )
+            else:
+                # If no priority array, assume we can update
+                prio_clear[i] = True
+        except Exception:
+            # If priority checking fails, err on the side of not updating
+            prio_clear[i] = False
+
+    for i in cmd_idx:
+        refresh_priority(i)
+
+    def note_write(apdu):
+        i = objid_index.get(apdu.objectIdentifier)
+        if i is not None:
+            refresh_priority(i)
+
+    # Event set by the WriteProperty hook whenever a client writes a value
+    write_event = asyncio.Event()
+    hooked = install_write_event_hook(app, write_event, note_write)
+
     # ────────────── Main simulation loop ─────────────────────────────────────
-    while True:
-        now = time.time()
-        
-        # Simulation with proper BACnet priority handling
-        for name, obj in objects.items():
-            try:
-                if not hasattr(obj, 'presentValue'):
-                    continue
-                    
-                # Get current value
-                current_val = obj.presentValue
-                
-                # Determine object type from BAC0 object
-                obj_type = str(type(obj).__name__).lower()
-                
-                # Check if this is an input object (should always update)
-                is_input = ('input' in obj_type or 
-                           obj_type in ['analoginput', 'binaryinput', 'multistateinput'])
-                
-                # Check if this is an output/value object (commandable - check priority)
-                is_commandable = ('output' in obj_type or 'value' in obj_type or
-                                obj_type in ['analogoutput', 'binaryoutput', 'multistateoutput',
-                                           'analogvalue', 'binaryvalue', 'multistatevalue'])
-                
-                # For inputs, always update based on simulation
-                if is_input:
-                    should_update = True
-                    
-                # For commandable objects, behavior depends on priority_aware setting
-                elif is_commandable:
-                    if priority_aware:
-                        # Only update if priority 16 is active (proper BACnet behavior)
-                        should_update = False
-                        try:
-                            # Check if object has priority array and if priority 16 is active
-                            if hasattr(obj, 'priorityArray'):
-                                priority_array = obj.priorityArray
-                                # If all higher priorities (1-15) are null, then priority 16 is active
-                                higher_priorities_active = any(
-                                    priority_array[i] is not None 
-                                    for i in range(15)  # priorities 1-15 (0-indexed)
-                                )
-                                should_update = not higher_priorities_active
-                            else:
-                                # If no priority array, assume we can update (fallback behavior)
-                                should_update = True
-                        except Exception:
-                            # If priority checking fails, err on the side of not updating outputs
-                            should_update = False
-                    else:
-                        # Legacy behavior - update all commandable objects
-                        should_update = True
-                else:
-                    # Unknown object type, skip
-                    should_update = False
-                
-                # Apply simulation updates only if appropriate
-                if should_update:
-                    # Add realistic variation based on object name/type
-                    if 'Temperature' in name:
-                        # Temperature sine wave with small random variation
-                        base_temp = 20 + 5 * math.sin(2 * math.pi * now / OUTDOOR_CYCLE_S)
-                        obj.presentValue = base_temp + random.uniform(-1, 1)
-                        
-                    elif 'Humidity' in name:
-                        # Humidity random walk
-                        new_val = max(20, min(80, current_val + random.uniform(-0.5, 0.5)))
-                        obj.presentValue = new_val
-                        
-                    elif 'Airflow' in name or 'Flow' in name:
-                        # Airflow with some variation
-                        base_flow = 100 + 50 * math.sin(2 * math.pi * now / (OUTDOOR_CYCLE_S * 2))
-                        obj.presentValue = max(0, base_flow + random.uniform(-10, 10))
-                        
-                    elif 'Pressure' in name:
-                        # Pressure variation
-                        obj.presentValue = max(0, current_val + random.uniform(-0.1, 0.1))
-                        
-                    elif 'multistate' in obj_type.lower():
-                        # For multistate objects, occasionally change state
-                        if random.random() < 0.001:  # 0.1% chance per step
-                            try:
-                                num_states = obj.numberOfStates if hasattr(obj, 'numberOfStates') else 4
-                                new_state = random.randint(1, num_states)
-                                obj.presentValue = new_state
-                            except Exception:
-                                pass
-                        
-                    elif 'binary' in obj_type.lower():
-                        # For binary objects, occasionally flip state
-                        if random.random() < 0.0005:  # 0.05% chance per step
-                            obj.presentValue = 'active' if obj.presentValue == 'inactive' else 'inactive'
-                        
-            except Exception as e:
-                # Log which object failed for debugging
-                if hasattr(obj, 'objectName'):
-                    safe_print(f"⚠️ Simulation error for {obj.objectName}: {e}")
-                pass  # Skip objects that can't be updated
-        
-        await asyncio.sleep(STEP)
+    def simulate_pass(now):
+        # Which points may be written this pass: inputs always update,
+        # commandable objects only when priority 16 is active (proper
+        # BACnet behavior) unless priority_aware is off
+        if priority_aware:
+            if not hooked:
+                # No write hook: fall back to rescanning each pass
+                for i in cmd_idx:
+                    refresh_priority(i)
+            allowed = is_input | (is_commandable & prio_clear)
+        else:
+            # Legacy behavior - update all commandable objects
+            allowed = is_input | is_commandable
+
+        # Environment bases are loop-invariant per tick
+        temp_base = 20 + 5 * math.sin(OMEGA_DAY * now)
+        flow_base = 100 + 50 * math.sin(OMEGA_FLOW * now)
+
+        # Analog categories: one compiled kernel call updates the shadow
+        # values in place and reports which points cleared their deadband;
+        # Python only scatters the changed subset back to the BACnet objects
+        noise = rng.uniform(-1.0, 1.0, analog_idx.size)
+        changed = kernel_step(analog_idx, cat_codes, allowed, values,
+                              last_written, temp_base, flow_base, noise)
+        idx = np.nonzero(changed)[0]
+        try:
+            # Untriggered try is free; one guard covers the whole scatter
+            for i in idx:
+                sim_objs[i].presentValue = float(values[i])
+        except Exception:
+            # A refused property write must not unwind the gathered
+            # simulation tasks — finish per-object, skipping the offender
+            for i in idx:
+                try:
+                    sim_objs[i].presentValue = float(values[i])
+                except Exception:
+                    pass
+
+        # Multistate objects occasionally change state (0.1% chance per step)
+        idx = multi_idx[allowed[multi_idx]]
+        if idx.size:
+            for i in idx[rng.random(idx.size) < 0.001]:
+                try:
+                    sim_objs[i].presentValue = int(rng.integers(1, num_states[i] + 1))
+                except Exception:
+                    pass
+
+        # Binary objects occasionally flip state (0.05% chance per step)
+        idx = bin_idx[allowed[bin_idx]]
+        if idx.size:
+            for i in idx[rng.random(idx.size) < 0.0005]:
+                binary_state[i] ^= 1
+                try:
+                    sim_objs[i].presentValue = ('inactive', 'active')[binary_state[i]]
+                except Exception:
+                    pass
+
+    async def environment_loop():
+        # Periodic environment tick (sine waves, random walks) paced by
+        # absolute monotonic deadlines, so jitter in a tick's cost does
+        # not accumulate into phase drift
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            simulate_pass(loop.time())
+            deadline += STEP
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                deadline = loop.time()  # fell behind - resync, don't burst
+
+    async def on_write():
+        # Reactive pass: recompute dependents as soon as a write lands
+        # instead of waiting out the remainder of the scan interval
+        loop = asyncio.get_running_loop()
+        while True:
+            await write_event.wait()
+            write_event.clear()
+            simulate_pass(loop.time())
+
+    if hooked:
+        await asyncio.gather(environment_loop(), on_write())
+    else:
+        await environment_loop()
 
 # ─────────────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
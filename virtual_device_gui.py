@@ -16,6 +16,7 @@ Usage:
 """
 
 import tkinter as tk
+import tkinter.font as tkFont
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 import threading
 import configparser
@@ -23,36 +24,159 @@ import sys
 import io
 import time
 import queue
+import re
 import subprocess
 import os
 import socket
 from pathlib import Path
 
+# Shared grid sticky specs — built once instead of a fresh tuple per .grid()
+STICKY_ALL = (tk.W, tk.E, tk.N, tk.S)
+STICKY_WE = (tk.W, tk.E)
+
+# Progress lines arrive once per chunk of created objects; match them with a
+# precompiled pattern instead of chained substring/split probes per line
+_PROGRESS_RE = re.compile(r"Creating objects\.\.\..*?(\d+)\s*%")
+
+# One row per GUI setting: (section, option, StringVar attribute, default).
+# Save, load and reset all walk this table instead of repeating the list.
+# A None default means "regenerate" — the device IP depends on the local host.
+_CFG_SPEC = (
+    ('device', 'port', 'port_var', '47809'),
+    ('device', 'ip', 'ip_var', None),
+    ('device', 'device_id', 'device_id_var', '3001'),
+    ('device', 'device_name', 'device_name_var', 'Virtual VAV Unit'),
+    ('device', 'device_description', 'device_desc_var',
+     'Enhanced Virtual BACnet Device with CSV Point Loading'),
+    ('data', 'points_file', 'points_file_var', 'points.csv'),
+    ('simulation', 'step_interval', 'step_interval_var', '0.5'),
+    ('simulation', 'ai_variation_range', 'ai_variation_var', '0.15'),
+    ('simulation', 'ao_priority16_variation', 'ao_variation_var', '0.25'),
+    ('simulation', 'binary_flip_probability', 'binary_flip_var', '0.01'),
+    ('environment', 'outdoor_temp_cycle_minutes', 'temp_cycle_var', '20'),
+    ('environment', 'outdoor_temp_base', 'base_temp_var', '21.0'),
+    ('environment', 'outdoor_temp_amplitude', 'temp_amplitude_var', '6.0'),
+)
+
+_CFG_DEFAULTS = {attr: default for _sec, _opt, attr, default in _CFG_SPEC}
+
+# Settings that must parse as numbers before a launch or save makes sense;
+# the entries also get key-level validation so stray characters never land
+_NUMERIC_FIELDS = {
+    'port_var': (int, 'Port'),
+    'device_id_var': (int, 'Device ID'),
+    'step_interval_var': (float, 'Step Interval'),
+    'ai_variation_var': (float, 'AI Variation Range'),
+    'ao_variation_var': (float, 'AO Priority 16 Variation'),
+    'binary_flip_var': (float, 'Binary Flip Probability'),
+    'temp_cycle_var': (float, 'Outdoor Temp Cycle'),
+    'base_temp_var': (float, 'Base Temperature'),
+    'temp_amplitude_var': (float, 'Temperature Amplitude'),
+}
+
+_NUMERIC_KEY_RE = re.compile(r'-?\d*\.?\d*$')
+
+# Every tooltip in the app, keyed by a short id. ToolTip instances hold only
+# the key; the text is looked up when a tooltip is actually shown.
+TOOLTIPS = {
+    'port': "UDP port for BACnet communication\n• Standard BACnet port is 47808\n• Use different ports to avoid conflicts\n• Range: 1024-65535",
+    'ip': "IP address for BACnet communication\n• Must be unique on your network\n• Auto-detects your local network\n• Click 'Auto' to regenerate automatically",
+    'auto_ip': "Automatically generate a unique IP address\n• Uses your current network settings\n• Assigns next available address in range",
+    'device_id': "BACnet device instance ID\n• Must be unique on your BACnet network\n• This is how the device appears in BACnet browsers\n• Range: 1-4194303",
+    'device_name': "Device name visible in BACnet browsers\n• Keep it descriptive but concise\n• Shows up in YABE, VTS, and other BACnet tools",
+    'device_desc': "Device description shown in BACnet browsers\n• Provide detailed information about the device's purpose\n• Helps identify the device in network discovery",
+    'points_file': "CSV file containing BACnet object definitions\n• Should have columns: Type, Instance, Name, PresentValue, Override, Description\n• If file doesn't exist, simulator will create a minimal test device\n• Supports Analog, Binary, and Multistate objects",
+    'step_interval': "Simulation update interval in seconds\n• Lower values = more responsive simulation, higher CPU usage\n• Range: 0.1-10.0\n• Recommended: 0.5-2.0 seconds",
+    'ai_variation': "Random variation for analog inputs (percentage)\n• Simulates sensor noise and real-world fluctuations\n• 0.15 = ±15% variation from base value\n• Range: 0.0-1.0",
+    'ao_variation': "Variation for analog outputs with priority 16 (percentage)\n• Simulates automatic control system adjustments\n• Only affects outputs that have been written to with priority 16\n• Range: 0.0-1.0",
+    'binary_flip': "Probability of binary inputs changing state per simulation step\n• Simulates alarm conditions, status changes, and sensor triggers\n• 0.01 = 1% chance per step (with 0.5s steps = ~1 change per 50 seconds)\n• Range: 0.0-1.0",
+    'temp_cycle': "Duration of outdoor temperature cycle in minutes\n• Creates realistic daily temperature patterns\n• 20 minutes = accelerated daily cycle for testing\n• 1440 minutes = real 24-hour cycle\n• Currently used for temperature sensors with 'Temperature' in their name",
+    'base_temp': "Base outdoor temperature in degrees Celsius\n• Average temperature around which variations occur\n• Typical values: 15-25°C depending on season/location\n• Note: Currently hard-coded to 20°C in simulation",
+    'temp_amplitude': "Temperature swing amplitude in degrees Celsius\n• How much temperature varies above/below base temperature\n• Creates morning cool / afternoon warm cycles\n• Typical values: 3-10°C\n• Note: Currently hard-coded to 5°C in simulation",
+    'env_info': "Environmental simulation creates:\n• Sine wave temperature cycles for outdoor sensors\n• Random walk for humidity sensors\n• Realistic variations for airflow sensors\n• Only affects objects with specific keywords in their names",
+    'load_config': "Load configuration from an INI file\n• Restores all device and simulation settings\n• Useful for switching between different device configurations",
+    'save_config': "Save current configuration to an INI file\n• Preserves all settings for future use\n• Creates a reusable device configuration",
+    'reset_defaults': "Reset all settings to default values\n• Restores factory default configuration\n• Useful for starting over with clean settings",
+    'start': "Start the virtual BACnet device\n• Creates BACnet objects from CSV file\n• Begins simulation with current settings\n• Device becomes discoverable on network",
+    'stop': "Stop the virtual BACnet device\n• Terminates simulation\n• Releases network port\n• Device no longer discoverable",
+    'clear_console': "Clear all console output\n• Removes all logged messages\n• Useful for focusing on current session",
+}
+
+# Plain label+entry rows of the configuration panel, keyed by section title.
+# Each row: (grid row, label text, StringVar attribute, entry width, tooltip
+# key). Rows that need extra widgets (device IP with Auto, points file with
+# Browse, the environmental info note) are still built by hand in
+# create_config_panel.
+_FIELD_ROWS = {
+    'Device Settings': (
+        (0, 'Port:', 'port_var', 10, 'port'),
+        (2, 'Device ID:', 'device_id_var', 10, 'device_id'),
+        (3, 'Device Name:', 'device_name_var', None, 'device_name'),
+        (4, 'Description:', 'device_desc_var', None, 'device_desc'),
+    ),
+    'Simulation Settings': (
+        (0, 'Step Interval (s):', 'step_interval_var', 10, 'step_interval'),
+        (1, 'AI Variation Range:', 'ai_variation_var', 10, 'ai_variation'),
+        (2, 'AO Priority 16 Variation:', 'ao_variation_var', 10, 'ao_variation'),
+        (3, 'Binary Flip Probability:', 'binary_flip_var', 10, 'binary_flip'),
+    ),
+    'Environment Settings': (
+        (0, 'Outdoor Temp Cycle (min):', 'temp_cycle_var', 10, 'temp_cycle'),
+        (1, 'Base Temperature (°C):', 'base_temp_var', 10, 'base_temp'),
+        (2, 'Temperature Amplitude (°C):', 'temp_amplitude_var', 10, 'temp_amplitude'),
+    ),
+}
+
 class ToolTip:
     """Simple tooltip implementation for widgets"""
-    def __init__(self, widget, text):
+    # One hidden Toplevel+Label pair serves every tooltip in the app; each
+    # hover just retexts, moves and deiconifies it instead of constructing
+    # and destroying widgets per crossing
+    _win = None
+    _label = None
+
+    # Dwell time before a tooltip appears; sweeping the mouse across the
+    # panel cancels the pending timer and never touches the window at all
+    SHOW_DELAY_MS = 350
+
+    def __init__(self, widget, key):
         self.widget = widget
-        self.text = text
+        self.key = key
+        self._after_id = None
         self.widget.bind("<Enter>", self.enter)
         self.widget.bind("<Leave>", self.leave)
-        self.tooltip = None
+
+    @classmethod
+    def _shared_window(cls, widget):
+        if cls._win is None:
+            cls._win = tk.Toplevel(widget)
+            cls._win.wm_overrideredirect(True)
+            cls._win.withdraw()
+            cls._label = tk.Label(cls._win, background="lightyellow",
+                                  relief="solid", borderwidth=1,
+                                  font=("Arial", 9), wraplength=300)
+            cls._label.pack()
+        return cls._win
 
     def enter(self, event=None):
+        self._after_id = self.widget.after(self.SHOW_DELAY_MS, self._show)
+
+    def _show(self):
+        self._after_id = None
         x = self.widget.winfo_rootx() + 25
         y = self.widget.winfo_rooty() + 25
-        
-        self.tooltip = tk.Toplevel(self.widget)
-        self.tooltip.wm_overrideredirect(True)
-        self.tooltip.wm_geometry(f"+{x}+{y}")
-        
-        label = tk.Label(self.tooltip, text=self.text, background="lightyellow",
-                        relief="solid", borderwidth=1, font=("Arial", 9), wraplength=300)
-        label.pack()
+
+        win = self._shared_window(self.widget)
+        ToolTip._label.configure(text=TOOLTIPS[self.key])
+        win.wm_geometry(f"+{x}+{y}")
+        win.deiconify()
 
     def leave(self, event=None):
-        if self.tooltip:
-            self.tooltip.destroy()
-            self.tooltip = None
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        if ToolTip._win is not None:
+            ToolTip._win.withdraw()
 
 class VirtualDeviceGUI:
     def __init__(self, root):
@@ -60,32 +184,88 @@ class VirtualDeviceGUI:
         self.root.title("Virtual BACnet Device Simulator")
         self.root.geometry("1000x700")
         self.root.minsize(800, 600)
-        
+
+        # Keep the window hidden while widgets are gridded so the user sees
+        # one finished layout instead of incremental relayout flicker
+        self.root.withdraw()
+
+
         # Initialize variables
         self.device_process = None
         self.is_running = False
         self.config_file = "virtual_device.ini"
         self.output_queue = queue.Queue()
+
+        # One ConfigParser serves every load/save; .clear() between uses.
+        # No interpolation: values are plain strings and a literal '%' in,
+        # say, the device description must not trip the '%%' syntax
+        self._cfg = configparser.ConfigParser(interpolation=None)
+
+        # Local IP is looked up once; the Auto button forces a refresh
+        self._cached_local_ip = None
+
+        # Last (path, INI text) written to disk — identical saves are skipped
+        self._last_config_save = (None, None)
+
+        # Console line budget: the Text widget is trimmed from the top so
+        # long-running devices can't grow it (and its redraw cost) unbounded
+        self._log_lines = 0
+        self._log_cap = 5000
+        self._idle_ticks = 0
+        self._monitor_scheduled = False
+
+        # Last applied progress/label/status — identical repeats are skipped
+        self._last_progress = None
+        self._last_label = None
+        self._last_status = None
+
+        # Timestamp cache: strftime only runs when the wall-clock second rolls
+        self._ts_sec = -1
+        self._ts_str = ""
+
+        # One long-lived worker runs the device subprocesses; start_device
+        # just posts a command instead of spawning a fresh thread per launch
+        self._cmd_q = queue.Queue()
+        threading.Thread(target=self._worker_loop, daemon=True).start()
+
+        # Child environment is the same for every launch — build it once
+        self._child_env = os.environ.copy()
+        self._child_env['PYTHONUNBUFFERED'] = '1'  # force unbuffered output
         
         # Create the GUI
+        self._vcmd_numeric = self.root.register(self._validate_numeric_key)
+
+        # Named Font objects are resolved once; inline ("Arial", ...) tuples
+        # would go through Tk's font lookup on every widget construction
+        self._title_font = tkFont.Font(family="Arial", size=16, weight="bold")
+        self._info_font = tkFont.Font(family="Arial", size=8)
+
         self.create_widgets()
-        self.load_config()
-        
-        # Start output monitoring
-        self.monitor_output()
+
+        # One geometry pass over the finished tree, then show the window.
+        # Reading the config file can wait until the first paint is done
+        self.root.update_idletasks()
+        self.root.deiconify()
+        self.root.after_idle(self.load_config)
+
+        # Start output monitoring (first tick lands after mainloop starts)
+        self._ensure_monitor()
         
     def get_local_ip(self):
-        """Get the local IP address"""
+        """Get the local IP address (cached after the first lookup)"""
+        if self._cached_local_ip:
+            return self._cached_local_ip
         try:
             # Connect to a remote address to get local IP
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            local_ip = s.getsockname()[0]
-            s.close()
-            return local_ip
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                s.connect(("8.8.8.8", 80))
+                local_ip = s.getsockname()[0]
         except:
             return "192.168.1.100"
-    
+        self._cached_local_ip = local_ip
+        return local_ip
+
+
     def generate_device_ip(self, base_ip=None):
         """Generate a unique IP address for this device"""
         if base_ip is None:
@@ -96,6 +276,7 @@ class VirtualDeviceGUI:
     
     def auto_generate_ip(self):
         """Auto-detect the local IP address"""
+        self._cached_local_ip = None  # force a fresh lookup
         new_ip = self.generate_device_ip()
         self.ip_var.set(new_ip)
         self.log_message(f"✔ Auto-detected local IP: {new_ip}")
@@ -103,7 +284,7 @@ class VirtualDeviceGUI:
     def create_widgets(self):
         # Create main frame with notebook for tabs
         main_frame = ttk.Frame(self.root, padding="10")
-        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        main_frame.grid(row=0, column=0, sticky=STICKY_ALL)
         
         # Configure grid weights
         self.root.columnconfigure(0, weight=1)
@@ -113,216 +294,167 @@ class VirtualDeviceGUI:
         
         # Title
         title_label = ttk.Label(main_frame, text="Virtual BACnet Device Simulator", 
-                               font=("Arial", 16, "bold"))
+                               font=self._title_font)
         title_label.grid(row=0, column=0, columnspan=2, pady=(0, 10))
         
         # Left panel - Configuration
         config_frame = ttk.LabelFrame(main_frame, text="Configuration", padding="10")
-        config_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 5))
+        config_frame.grid(row=1, column=0, sticky=STICKY_ALL, padx=(0, 5))
         config_frame.columnconfigure(1, weight=1)
         
         # Right panel - Control and Output
         control_frame = ttk.Frame(main_frame)
-        control_frame.grid(row=1, column=1, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(5, 0))
+        control_frame.grid(row=1, column=1, sticky=STICKY_ALL, padx=(5, 0))
         control_frame.columnconfigure(0, weight=1)
         control_frame.rowconfigure(2, weight=1)
         
         self.create_config_panel(config_frame)
         self.create_control_panel(control_frame)
         
+    def _section_frame(self, parent, row, title):
+        """Create a settings LabelFrame and its plain label+entry rows
+
+        The rows come from _FIELD_ROWS; each creates a StringVar (stored as
+        the named attribute, seeded from _CFG_DEFAULTS), a label, an entry
+        and a tooltip. Section-specific widgets are added by the caller.
+        """
+        frame = ttk.LabelFrame(parent, text=title)
+        frame.grid(row=row, column=0, columnspan=2, sticky=STICKY_WE, pady=(0, 5))
+        frame.columnconfigure(1, weight=1)
+
+        for grid_row, text, attr, width, tooltip in _FIELD_ROWS.get(title, ()):
+            label = ttk.Label(frame, text=text)
+            label.grid(row=grid_row, column=0, sticky=tk.W, padx=(0, 5))
+            var = tk.StringVar(value=_CFG_DEFAULTS[attr])
+            setattr(self, attr, var)
+            kwargs = {'width': width} if width else {}
+            if attr in _NUMERIC_FIELDS:
+                kwargs['validate'] = 'key'
+                kwargs['validatecommand'] = (self._vcmd_numeric, '%P')
+            entry = ttk.Entry(frame, textvariable=var, **kwargs)
+            entry.grid(row=grid_row, column=1, sticky=STICKY_WE)
+            ToolTip(label, tooltip)
+
+        return frame
+
+    @staticmethod
+    def _validate_numeric_key(proposed):
+        """Key-level filter for numeric entries: allow digits, sign, dot"""
+        return _NUMERIC_KEY_RE.fullmatch(proposed) is not None
+
+    def check_numeric_settings(self):
+        """Verify numeric settings parse; shows one dialog listing failures"""
+        bad = []
+        for attr, (cast, label) in _NUMERIC_FIELDS.items():
+            try:
+                cast(getattr(self, attr).get())
+            except ValueError:
+                bad.append(label)
+        if bad:
+            messagebox.showerror(
+                "Invalid settings",
+                "These settings are not valid numbers:\n"
+                + "\n".join(f"• {b}" for b in bad))
+            return False
+        return True
+
     def create_config_panel(self, parent):
         """Create configuration input panel"""
         row = 0
-        
-        # Device Settings
-        device_frame = ttk.LabelFrame(parent, text="Device Settings", padding="5")
-        device_frame.grid(row=row, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
-        device_frame.columnconfigure(1, weight=1)
-        
-        # Port
-        port_label = ttk.Label(device_frame, text="Port:")
-        port_label.grid(row=0, column=0, sticky=tk.W, padx=(0, 5))
-        self.port_var = tk.StringVar(value="47809")
-        port_entry = ttk.Entry(device_frame, textvariable=self.port_var, width=10)
-        port_entry.grid(row=0, column=1, sticky=(tk.W, tk.E))
-        ToolTip(port_label, "UDP port for BACnet communication\n• Standard BACnet port is 47808\n• Use different ports to avoid conflicts\n• Range: 1024-65535")
-        
+
+        # Device Settings (port/ID/name/description rows come from the spec)
+        device_frame = self._section_frame(parent, row, "Device Settings")
+
         # IP Address
         ip_label = ttk.Label(device_frame, text="IP Address:")
         ip_label.grid(row=1, column=0, sticky=tk.W, padx=(0, 5))
         ip_frame = ttk.Frame(device_frame)
-        ip_frame.grid(row=1, column=1, sticky=(tk.W, tk.E))
+        ip_frame.grid(row=1, column=1, sticky=STICKY_WE)
         ip_frame.columnconfigure(0, weight=1)
         
         self.ip_var = tk.StringVar(value=self.generate_device_ip())
         ip_entry = ttk.Entry(ip_frame, textvariable=self.ip_var)
-        ip_entry.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        ip_entry.grid(row=0, column=0, sticky=STICKY_WE)
         auto_ip_btn = ttk.Button(ip_frame, text="Auto", command=self.auto_generate_ip, width=6)
         auto_ip_btn.grid(row=0, column=1, padx=(5, 0))
-        ToolTip(ip_label, "IP address for BACnet communication\n• Must be unique on your network\n• Auto-detects your local network\n• Click 'Auto' to regenerate automatically")
-        ToolTip(auto_ip_btn, "Automatically generate a unique IP address\n• Uses your current network settings\n• Assigns next available address in range")
-        
-        # Device ID
-        id_label = ttk.Label(device_frame, text="Device ID:")
-        id_label.grid(row=2, column=0, sticky=tk.W, padx=(0, 5))
-        self.device_id_var = tk.StringVar(value="3001")
-        id_entry = ttk.Entry(device_frame, textvariable=self.device_id_var, width=10)
-        id_entry.grid(row=2, column=1, sticky=(tk.W, tk.E))
-        ToolTip(id_label, "BACnet device instance ID\n• Must be unique on your BACnet network\n• This is how the device appears in BACnet browsers\n• Range: 1-4194303")
-        
-        # Device Name
-        name_label = ttk.Label(device_frame, text="Device Name:")
-        name_label.grid(row=3, column=0, sticky=tk.W, padx=(0, 5))
-        self.device_name_var = tk.StringVar(value="Virtual VAV Unit")
-        name_entry = ttk.Entry(device_frame, textvariable=self.device_name_var)
-        name_entry.grid(row=3, column=1, sticky=(tk.W, tk.E))
-        ToolTip(name_label, "Device name visible in BACnet browsers\n• Keep it descriptive but concise\n• Shows up in YABE, VTS, and other BACnet tools")
-        
-        # Device Description
-        desc_label = ttk.Label(device_frame, text="Description:")
-        desc_label.grid(row=4, column=0, sticky=tk.W, padx=(0, 5))
-        self.device_desc_var = tk.StringVar(value="Enhanced Virtual BACnet Device with CSV Point Loading")
-        desc_entry = ttk.Entry(device_frame, textvariable=self.device_desc_var)
-        desc_entry.grid(row=4, column=1, sticky=(tk.W, tk.E))
-        ToolTip(desc_label, "Device description shown in BACnet browsers\n• Provide detailed information about the device's purpose\n• Helps identify the device in network discovery")
-        
+        ToolTip(ip_label, 'ip')
+        ToolTip(auto_ip_btn, 'auto_ip')
+
         row += 1
         
         # Data Settings
-        data_frame = ttk.LabelFrame(parent, text="Data Source", padding="5")
-        data_frame.grid(row=row, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
-        data_frame.columnconfigure(1, weight=1)
-        
+        data_frame = self._section_frame(parent, row, "Data Source")
+
         # Points File
         points_label = ttk.Label(data_frame, text="Points CSV File:")
         points_label.grid(row=0, column=0, sticky=tk.W, padx=(0, 5))
         points_frame = ttk.Frame(data_frame)
-        points_frame.grid(row=0, column=1, sticky=(tk.W, tk.E))
+        points_frame.grid(row=0, column=1, sticky=STICKY_WE)
         points_frame.columnconfigure(0, weight=1)
         
-        self.points_file_var = tk.StringVar(value="points.csv")
+        self.points_file_var = tk.StringVar(value=_CFG_DEFAULTS['points_file_var'])
         points_entry = ttk.Entry(points_frame, textvariable=self.points_file_var)
-        points_entry.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        points_entry.grid(row=0, column=0, sticky=STICKY_WE)
         ttk.Button(points_frame, text="Browse", command=self.browse_points_file, width=8).grid(row=0, column=1, padx=(5, 0))
-        ToolTip(points_label, "CSV file containing BACnet object definitions\n• Should have columns: Type, Instance, Name, PresentValue, Override, Description\n• If file doesn't exist, simulator will create a minimal test device\n• Supports Analog, Binary, and Multistate objects")
+        ToolTip(points_label, 'points_file')
         
         row += 1
-        
-        # Simulation Settings
-        sim_frame = ttk.LabelFrame(parent, text="Simulation Settings", padding="5")
-        sim_frame.grid(row=row, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
-        sim_frame.columnconfigure(1, weight=1)
-        
-        # Step Interval
-        step_label = ttk.Label(sim_frame, text="Step Interval (s):")
-        step_label.grid(row=0, column=0, sticky=tk.W, padx=(0, 5))
-        self.step_interval_var = tk.StringVar(value="0.5")
-        step_entry = ttk.Entry(sim_frame, textvariable=self.step_interval_var, width=10)
-        step_entry.grid(row=0, column=1, sticky=(tk.W, tk.E))
-        ToolTip(step_label, "Simulation update interval in seconds\n• Lower values = more responsive simulation, higher CPU usage\n• Range: 0.1-10.0\n• Recommended: 0.5-2.0 seconds")
-        
-        # AI Variation Range
-        ai_label = ttk.Label(sim_frame, text="AI Variation Range:")
-        ai_label.grid(row=1, column=0, sticky=tk.W, padx=(0, 5))
-        self.ai_variation_var = tk.StringVar(value="0.15")
-        ai_entry = ttk.Entry(sim_frame, textvariable=self.ai_variation_var, width=10)
-        ai_entry.grid(row=1, column=1, sticky=(tk.W, tk.E))
-        ToolTip(ai_label, "Random variation for analog inputs (percentage)\n• Simulates sensor noise and real-world fluctuations\n• 0.15 = ±15% variation from base value\n• Range: 0.0-1.0")
-        
-        # AO Priority 16 Variation
-        ao_label = ttk.Label(sim_frame, text="AO Priority 16 Variation:")
-        ao_label.grid(row=2, column=0, sticky=tk.W, padx=(0, 5))
-        self.ao_variation_var = tk.StringVar(value="0.25")
-        ao_entry = ttk.Entry(sim_frame, textvariable=self.ao_variation_var, width=10)
-        ao_entry.grid(row=2, column=1, sticky=(tk.W, tk.E))
-        ToolTip(ao_label, "Variation for analog outputs with priority 16 (percentage)\n• Simulates automatic control system adjustments\n• Only affects outputs that have been written to with priority 16\n• Range: 0.0-1.0")
-        
-        # Binary Flip Probability
-        binary_label = ttk.Label(sim_frame, text="Binary Flip Probability:")
-        binary_label.grid(row=3, column=0, sticky=tk.W, padx=(0, 5))
-        self.binary_flip_var = tk.StringVar(value="0.01")
-        binary_entry = ttk.Entry(sim_frame, textvariable=self.binary_flip_var, width=10)
-        binary_entry.grid(row=3, column=1, sticky=(tk.W, tk.E))
-        ToolTip(binary_label, "Probability of binary inputs changing state per simulation step\n• Simulates alarm conditions, status changes, and sensor triggers\n• 0.01 = 1% chance per step (with 0.5s steps = ~1 change per 50 seconds)\n• Range: 0.0-1.0")
-        
+
+        # Simulation Settings (all rows come from the spec)
+        self._section_frame(parent, row, "Simulation Settings")
+
         row += 1
-        
+
         # Environment Settings
-        env_frame = ttk.LabelFrame(parent, text="Environment Settings", padding="5")
-        env_frame.grid(row=row, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
-        env_frame.columnconfigure(1, weight=1)
-        
-        # Outdoor Temp Cycle
-        cycle_label = ttk.Label(env_frame, text="Outdoor Temp Cycle (min):")
-        cycle_label.grid(row=0, column=0, sticky=tk.W, padx=(0, 5))
-        self.temp_cycle_var = tk.StringVar(value="20")
-        cycle_entry = ttk.Entry(env_frame, textvariable=self.temp_cycle_var, width=10)
-        cycle_entry.grid(row=0, column=1, sticky=(tk.W, tk.E))
-        ToolTip(cycle_label, "Duration of outdoor temperature cycle in minutes\n• Creates realistic daily temperature patterns\n• 20 minutes = accelerated daily cycle for testing\n• 1440 minutes = real 24-hour cycle\n• Currently used for temperature sensors with 'Temperature' in their name")
-        
-        # Base Temperature
-        base_label = ttk.Label(env_frame, text="Base Temperature (°C):")
-        base_label.grid(row=1, column=0, sticky=tk.W, padx=(0, 5))
-        self.base_temp_var = tk.StringVar(value="21.0")
-        base_entry = ttk.Entry(env_frame, textvariable=self.base_temp_var, width=10)
-        base_entry.grid(row=1, column=1, sticky=(tk.W, tk.E))
-        ToolTip(base_label, "Base outdoor temperature in degrees Celsius\n• Average temperature around which variations occur\n• Typical values: 15-25°C depending on season/location\n• Note: Currently hard-coded to 20°C in simulation")
-        
-        # Temperature Amplitude
-        amp_label = ttk.Label(env_frame, text="Temperature Amplitude (°C):")
-        amp_label.grid(row=2, column=0, sticky=tk.W, padx=(0, 5))
-        self.temp_amplitude_var = tk.StringVar(value="6.0")
-        amp_entry = ttk.Entry(env_frame, textvariable=self.temp_amplitude_var, width=10)
-        amp_entry.grid(row=2, column=1, sticky=(tk.W, tk.E))
-        ToolTip(amp_label, "Temperature swing amplitude in degrees Celsius\n• How much temperature varies above/below base temperature\n• Creates morning cool / afternoon warm cycles\n• Typical values: 3-10°C\n• Note: Currently hard-coded to 5°C in simulation")
-        
+        env_frame = self._section_frame(parent, row, "Environment Settings")
+
         # Info label about environmental settings
         info_label = ttk.Label(env_frame, text="ℹ️ Environmental settings create realistic temperature cycles for sensors", 
-                              font=("Arial", 8), foreground="blue")
+                              font=self._info_font, foreground="blue")
         info_label.grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
-        ToolTip(info_label, "Environmental simulation creates:\n• Sine wave temperature cycles for outdoor sensors\n• Random walk for humidity sensors\n• Realistic variations for airflow sensors\n• Only affects objects with specific keywords in their names")
+        ToolTip(info_label, 'env_info')
         
         row += 1
         
         # Config file controls
         config_controls = ttk.Frame(parent)
-        config_controls.grid(row=row, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
+        config_controls.grid(row=row, column=0, columnspan=2, sticky=STICKY_WE, pady=(10, 0))
         
         load_btn = ttk.Button(config_controls, text="Load Config", command=self.load_config_file)
         load_btn.pack(side=tk.LEFT, padx=(0, 5))
-        ToolTip(load_btn, "Load configuration from an INI file\n• Restores all device and simulation settings\n• Useful for switching between different device configurations")
+        ToolTip(load_btn, 'load_config')
         
         save_btn = ttk.Button(config_controls, text="Save Config", command=self.save_config_file)
         save_btn.pack(side=tk.LEFT, padx=(0, 5))
-        ToolTip(save_btn, "Save current configuration to an INI file\n• Preserves all settings for future use\n• Creates a reusable device configuration")
+        ToolTip(save_btn, 'save_config')
         
         reset_btn = ttk.Button(config_controls, text="Reset Defaults", command=self.reset_defaults)
         reset_btn.pack(side=tk.LEFT)
-        ToolTip(reset_btn, "Reset all settings to default values\n• Restores factory default configuration\n• Useful for starting over with clean settings")
+        ToolTip(reset_btn, 'reset_defaults')
         
     def create_control_panel(self, parent):
         """Create control panel with start/stop and output"""
         # Control buttons
         button_frame = ttk.LabelFrame(parent, text="Device Control", padding="10")
-        button_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 5))
+        button_frame.grid(row=0, column=0, sticky=STICKY_WE, pady=(0, 5))
         
         self.start_button = ttk.Button(button_frame, text="🚀 Start Device", 
                                       command=self.start_device, style="Green.TButton")
         self.start_button.pack(side=tk.LEFT, padx=(0, 10))
-        ToolTip(self.start_button, "Start the virtual BACnet device\n• Creates BACnet objects from CSV file\n• Begins simulation with current settings\n• Device becomes discoverable on network")
+        ToolTip(self.start_button, 'start')
         
         self.stop_button = ttk.Button(button_frame, text="⏹ Stop Device", 
                                      command=self.stop_device, state=tk.DISABLED, style="Red.TButton")
         self.stop_button.pack(side=tk.LEFT, padx=(0, 10))
-        ToolTip(self.stop_button, "Stop the virtual BACnet device\n• Terminates simulation\n• Releases network port\n• Device no longer discoverable")
+        ToolTip(self.stop_button, 'stop')
         
         # Status indicator
         self.status_label = ttk.Label(button_frame, text="● Stopped", foreground="red")
         self.status_label.pack(side=tk.LEFT, padx=(10, 0))
         
         # Progress bar
-        progress_frame = ttk.LabelFrame(parent, text="Progress", padding="5")
-        progress_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 5))
+        progress_frame = ttk.LabelFrame(parent, text="Progress")
+        progress_frame.grid(row=1, column=0, sticky=STICKY_WE, pady=(0, 5))
         
         self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(progress_frame, variable=self.progress_var, 
@@ -333,25 +465,26 @@ class VirtualDeviceGUI:
         self.progress_label.pack()
         
         # Console output
-        console_frame = ttk.LabelFrame(parent, text="Console Output", padding="5")
-        console_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        console_frame = ttk.LabelFrame(parent, text="Console Output")
+        console_frame.grid(row=2, column=0, sticky=STICKY_ALL)
         console_frame.columnconfigure(0, weight=1)
         console_frame.rowconfigure(0, weight=1)
         
         # Make console read-only
         self.console_text = scrolledtext.ScrolledText(console_frame, height=20, width=60, state=tk.DISABLED)
-        self.console_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.console_text.grid(row=0, column=0, sticky=STICKY_ALL)
         
         # Clear console button
         clear_btn = ttk.Button(console_frame, text="Clear Console", command=self.clear_console)
         clear_btn.grid(row=1, column=0, pady=(5, 0))
-        ToolTip(clear_btn, "Clear all console output\n• Removes all logged messages\n• Useful for focusing on current session")
+        ToolTip(clear_btn, 'clear_console')
         
     def clear_console(self):
         """Clear console output"""
         self.console_text.config(state=tk.NORMAL)
         self.console_text.delete(1.0, tk.END)
         self.console_text.config(state=tk.DISABLED)
+        self._log_lines = 0
         
     def browse_points_file(self):
         """Browse for points CSV file"""
@@ -385,108 +518,84 @@ class VirtualDeviceGUI:
     
     def load_config(self):
         """Load configuration from INI file"""
-        if not os.path.exists(self.config_file):
+        # config.read already skips missing files and reports what it parsed,
+        # so a separate existence stat is redundant
+        config = self._cfg
+        config.clear()
+        if not config.read(self.config_file):
             return
-            
-        config = configparser.ConfigParser()
-        config.read(self.config_file)
-        
+
         try:
-            # Device settings
-            if config.has_section('device'):
-                self.port_var.set(config.get('device', 'port', fallback='47809'))
-                self.ip_var.set(config.get('device', 'ip', fallback=self.generate_device_ip()))
-                self.device_id_var.set(config.get('device', 'device_id', fallback='3001'))
-                self.device_name_var.set(config.get('device', 'device_name', fallback='Virtual VAV Unit'))
-                self.device_desc_var.set(config.get('device', 'device_description', 
-                                                   fallback='Enhanced Virtual BACnet Device with CSV Point Loading'))
-            
-            # Data settings
-            if config.has_section('data'):
-                self.points_file_var.set(config.get('data', 'points_file', fallback='points.csv'))
-            
-            # Simulation settings
-            if config.has_section('simulation'):
-                self.step_interval_var.set(config.get('simulation', 'step_interval', fallback='0.5'))
-                self.ai_variation_var.set(config.get('simulation', 'ai_variation_range', fallback='0.15'))
-                self.ao_variation_var.set(config.get('simulation', 'ao_priority16_variation', fallback='0.25'))
-                self.binary_flip_var.set(config.get('simulation', 'binary_flip_probability', fallback='0.01'))
-            
-            # Environment settings
-            if config.has_section('environment'):
-                self.temp_cycle_var.set(config.get('environment', 'outdoor_temp_cycle_minutes', fallback='20'))
-                self.base_temp_var.set(config.get('environment', 'outdoor_temp_base', fallback='21.0'))
-                self.temp_amplitude_var.set(config.get('environment', 'outdoor_temp_amplitude', fallback='6.0'))
-                
+            for section, option, attr, default in _CFG_SPEC:
+                if not config.has_section(section):
+                    continue
+                if default is None:
+                    default = self.generate_device_ip()
+                getattr(self, attr).set(config.get(section, option, fallback=default))
+
             self.log_message("✔ Configuration loaded successfully")
         except Exception as e:
             self.log_message(f"✗ Error loading configuration: {e}")
     
+    def build_config(self):
+        """Fill the shared ConfigParser from the current GUI settings"""
+        config = self._cfg
+        config.clear()
+
+        for section, option, attr, _default in _CFG_SPEC:
+            if not config.has_section(section):
+                config.add_section(section)
+            config.set(section, option, getattr(self, attr).get())
+
+        return config
+
     def save_config(self):
         """Save current configuration to INI file"""
-        config = configparser.ConfigParser()
-        
-        # Device section
-        config.add_section('device')
-        config.set('device', 'port', self.port_var.get())
-        config.set('device', 'ip', self.ip_var.get())
-        config.set('device', 'device_id', self.device_id_var.get())
-        config.set('device', 'device_name', self.device_name_var.get())
-        config.set('device', 'device_description', self.device_desc_var.get())
-        
-        # Data section
-        config.add_section('data')
-        config.set('data', 'points_file', self.points_file_var.get())
-        
-        # Simulation section
-        config.add_section('simulation')
-        config.set('simulation', 'step_interval', self.step_interval_var.get())
-        config.set('simulation', 'ai_variation_range', self.ai_variation_var.get())
-        config.set('simulation', 'ao_priority16_variation', self.ao_variation_var.get())
-        config.set('simulation', 'binary_flip_probability', self.binary_flip_var.get())
-        
-        # Environment section
-        config.add_section('environment')
-        config.set('environment', 'outdoor_temp_cycle_minutes', self.temp_cycle_var.get())
-        config.set('environment', 'outdoor_temp_base', self.base_temp_var.get())
-        config.set('environment', 'outdoor_temp_amplitude', self.temp_amplitude_var.get())
-        
+        if not self.check_numeric_settings():
+            return
         try:
-            with open(self.config_file, 'w') as f:
-                config.write(f)
+            buf = io.StringIO()
+            self.build_config().write(buf)
+            data = buf.getvalue()
+
+            # Nothing changed since the last save — leave the file alone
+            if (self.config_file, data) == self._last_config_save:
+                self.log_message(f"✔ Configuration unchanged ({self.config_file})")
+                return
+
+            # Write-then-rename so a crash mid-save can't truncate the config
+            tmp = self.config_file + '.tmp'
+            with open(tmp, 'w') as f:
+                f.write(data)
+            os.replace(tmp, self.config_file)
+            self._last_config_save = (self.config_file, data)
             self.log_message(f"✔ Configuration saved to {self.config_file}")
         except Exception as e:
             self.log_message(f"✗ Error saving configuration: {e}")
     
     def reset_defaults(self):
         """Reset all settings to defaults"""
-        self.port_var.set("47809")
-        self.ip_var.set(self.generate_device_ip())
-        self.device_id_var.set("3001")
-        self.device_name_var.set("Virtual VAV Unit")
-        self.device_desc_var.set("Enhanced Virtual BACnet Device with CSV Point Loading")
-        self.points_file_var.set("points.csv")
-        self.step_interval_var.set("0.5")
-        self.ai_variation_var.set("0.15")
-        self.ao_variation_var.set("0.25")
-        self.binary_flip_var.set("0.01")
-        self.temp_cycle_var.set("20")
-        self.base_temp_var.set("21.0")
-        self.temp_amplitude_var.set("6.0")
+        for _section, _option, attr, default in _CFG_SPEC:
+            if default is None:
+                default = self.generate_device_ip()
+            getattr(self, attr).set(default)
         self.log_message("✔ Settings reset to defaults")
     
     def start_device(self):
         """Start the virtual device"""
         if self.is_running:
             return
-        
-        # Save current config before starting
-        temp_config = "temp_gui_config.ini"
-        old_config_file = self.config_file
-        self.config_file = temp_config
-        self.save_config()
-        self.config_file = old_config_file
-        
+        if not self.check_numeric_settings():
+            return
+
+
+        # Render the current settings to INI text; it is piped to the child's
+        # stdin, so no temp config file ever touches the disk
+        buf = io.StringIO()
+        self.build_config().write(buf)
+        config_text = buf.getvalue()
+
+
         # Start device in separate thread
         self.is_running = True
         self.start_button.config(state=tk.DISABLED)
@@ -494,9 +603,18 @@ class VirtualDeviceGUI:
         self.status_label.config(text="● Starting...", foreground="orange")
         self.progress_var.set(0)
         self.progress_label.config(text="Initializing...")
-        
-        # Start device process
-        threading.Thread(target=self.run_device, args=(temp_config,), daemon=True).start()
+
+        # The widgets were just set directly — drop the dedup caches so the
+        # first queued updates are never mistaken for repeats
+        self._last_progress = None
+        self._last_label = None
+        self._last_status = None
+        
+        # Hand the launch to the persistent worker thread. The address and
+        # port are snapshotted here too: StringVars belong to the Tk thread
+        # and the worker must never touch them
+        self._cmd_q.put((config_text, self.ip_var.get(), self.port_var.get()))
+        self._ensure_monitor()
         
         self.log_message("🚀 Starting Virtual BACnet Device...")
     
@@ -518,87 +636,168 @@ class VirtualDeviceGUI:
         self.progress_label.config(text="Device stopped")
         
         self.log_message("⏹ Virtual BACnet Device stopped")
-        
-        # Clean up temp config
-        try:
-            os.remove("temp_gui_config.ini")
-        except:
-            pass
-    
-    def run_device(self, config_file):
+
+    def _worker_loop(self):
+        """Persistent background thread: runs one device per queued command"""
+        while True:
+            config_text, address, port = self._cmd_q.get()
+            self.run_device(config_text, address, port)
+
+    def run_device(self, config_text, address, port):
         """Run the virtual device process"""
         try:
-            # Build command
+            # Build command; the config INI is piped over stdin
             cmd = [
                 sys.executable, "virtual_device.py",
-                "--config", config_file,
-                "-a", self.ip_var.get(),
-                "--port", self.port_var.get()
+                "--config", "-",
+                "-a", address,
+                "--port", port
             ]
             
-            # Start process with unbuffered output
-            env = os.environ.copy()
-            env['PYTHONUNBUFFERED'] = '1'  # Force unbuffered output
-            
+            # On Windows, keep the child from flashing a console window
+            creationflags = getattr(subprocess, 'CREATE_NO_WINDOW', 0) \
+                if os.name == 'nt' else 0
+
             self.device_process = subprocess.Popen(
                 cmd,
+                stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-                env=env
+                close_fds=True,
+                creationflags=creationflags,
+                env=self._child_env
             )
-            
-            # Update status
-            self.root.after(0, lambda: self.status_label.config(text="● Running", foreground="green"))
-            
-            # Read output
-            for line in iter(self.device_process.stdout.readline, ''):
-                if not self.is_running:
+            self.device_process.stdin.write(config_text.encode("utf-8"))
+            self.device_process.stdin.close()
+
+            # The reader thread only parses and enqueues; every Tk call
+            # happens on the main thread when monitor_output drains the queue
+            put = self.output_queue.put
+            put(("status", ("● Running", "green")))
+
+            # Read the pipe in large binary chunks and split lines ourselves:
+            # one syscall can deliver a whole burst of startup output instead
+            # of waking the thread once per line
+            fd = self.device_process.stdout.fileno()
+            buf = b""
+            while self.is_running:
+                chunk = os.read(fd, 65536)
+                if not chunk:
                     break
-                
-                line = line.strip()
-                if line:
+                buf += chunk
+                *lines, buf = buf.split(b"\n")
+
+                for raw in lines:
+                    line = raw.decode("utf-8", errors="replace").strip()
+                    if not line:
+                        continue
+
                     # Update progress bar based on output
-                    if "Creating objects..." in line and "%" in line:
-                        try:
-                            percent = int(line.split('%')[0].split()[-1])
-                            self.root.after(0, lambda p=percent: self.progress_var.set(p))
-                            self.root.after(0, lambda: self.progress_label.config(text="Creating BACnet objects..."))
-                        except:
-                            pass
+                    m = _PROGRESS_RE.search(line)
+                    if m:
+                        put(("progress", int(m.group(1))))
+                        put(("progress_label", "Creating BACnet objects..."))
                     elif "Successfully created" in line:
-                        self.root.after(0, lambda: self.progress_var.set(100))
-                        self.root.after(0, lambda: self.progress_label.config(text="Objects created successfully"))
+                        put(("progress", 100))
+                        put(("progress_label", "Objects created successfully"))
                     elif "Device is READY" in line:
-                        self.root.after(0, lambda: self.progress_label.config(text="Device ready and monitoring"))
-                    
+                        put(("progress_label", "Device ready and monitoring"))
+
                     # Add to console
-                    self.root.after(0, lambda msg=line: self.log_message(msg))
-            
+                    put(("log", line))
+
         except Exception as e:
-            self.root.after(0, lambda: self.log_message(f"✗ Error running device: {e}"))
+            self.output_queue.put(("log", f"✗ Error running device: {e}"))
             self.root.after(0, self.stop_device)
     
     def log_message(self, message):
-        """Add message to console output"""
+        """Add a single message to console output"""
+        self.log_messages([message])
+
+    def log_messages(self, messages):
+        """Add a batch of messages to the console in one widget update"""
+        now = int(time.time())
+        if now != self._ts_sec:
+            self._ts_sec = now
+            self._ts_str = time.strftime('%H:%M:%S')
+        ts = self._ts_str
+        text = "".join(f"{ts} - {m}\n" for m in messages)
+        # Only auto-scroll if the user is already at the bottom; don't yank
+        # them back while they're reading earlier output (and skip the
+        # layout pass see() forces)
+        at_bottom = self.console_text.yview()[1] > 0.999
         self.console_text.config(state=tk.NORMAL)
-        self.console_text.insert(tk.END, f"{time.strftime('%H:%M:%S')} - {message}\n")
-        self.console_text.see(tk.END)
+        self.console_text.insert(tk.END, text)
+        self._log_lines += len(messages)
+        # Trim in chunks (cap + hysteresis) so the delete doesn't run per-batch
+        if self._log_lines > self._log_cap + 500:
+            self.console_text.delete("1.0", f"{self._log_lines - self._log_cap + 1}.0")
+            self._log_lines = self._log_cap
+        if at_bottom:
+            self.console_text.see(tk.END)
         self.console_text.config(state=tk.DISABLED)
-    
+
     def monitor_output(self):
-        """Monitor output queue for messages"""
+        """Drain the output queue and apply all Tk updates on the main thread"""
+        log_batch = []
+        last_progress = None
+        last_label = None
+        last_status = None
+
         try:
-            while not self.output_queue.empty():
-                message = self.output_queue.get_nowait()
-                self.log_message(message)
+            for _ in range(500):            # bounded drain per tick
+                kind, payload = self.output_queue.get_nowait()
+                if kind == "log":
+                    log_batch.append(payload)
+                elif kind == "progress":
+                    last_progress = payload
+                elif kind == "progress_label":
+                    last_label = payload
+                elif kind == "status":
+                    last_status = payload
         except queue.Empty:
             pass
-        
+
+        # Apply each kind of update at most once per drain, and only when the
+        # value actually changed: intermediate progress values from a burst
+        # collapse into the final one, and repeats don't redraw anything
+        if last_progress is not None and last_progress != self._last_progress:
+            self._last_progress = last_progress
+            self.progress_var.set(last_progress)
+        if last_label is not None and last_label != self._last_label:
+            self._last_label = last_label
+            self.progress_label.config(text=last_label)
+        if last_status is not None and last_status != self._last_status:
+            self._last_status = last_status
+            text, color = last_status
+            self.status_label.config(text=text, foreground=color)
+        if log_batch:
+            self.log_messages(log_batch)
+
+        # Adaptive poll rate: tighten to 50 ms while output is flowing,
+        # back off toward 250 ms after a few empty drains
+        if log_batch or last_progress is not None or last_label is not None \
+                or last_status is not None:
+            self._idle_ticks = 0
+            delay = 50
+        else:
+            self._idle_ticks += 1
+            delay = min(250, 50 + self._idle_ticks * 50)
+
+            # Device stopped and queue drained: park the loop completely.
+            # start_device wakes it back up
+            if not self.is_running and self.output_queue.empty():
+                self._monitor_scheduled = False
+                return
+
         # Schedule next check
-        self.root.after(100, self.monitor_output)
+        self.root.after(delay, self.monitor_output)
+
+    def _ensure_monitor(self):
+        """(Re)start the output monitor loop if it is parked"""
+        if not self._monitor_scheduled:
+            self._monitor_scheduled = True
+            self.root.after(50, self.monitor_output)
     
     def on_closing(self):
         """Handle window closing"""
@@ -616,6 +815,9 @@ def main():
     style = ttk.Style()
     style.configure("Green.TButton", foreground="green")
     style.configure("Red.TButton", foreground="red")
+    # Section frames share their padding via the style rather than passing
+    # the same keyword to every LabelFrame constructor
+    style.configure("TLabelframe", padding=5)
     
     app = VirtualDeviceGUI(root)
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
@@ -0,0 +1,628 @@
+#!/usr/bin/env python3
+"""
+Enhanced Virtual VAV BACnet Device Simulator
+============================================
+
+Features:
+• Loads point definitions from CSV file
+• Uses INI configuration file for all settings
+• Adds missing object types (Analog/Binary/Multistate Values) if configured
+• Realistic simulation for all Input objects
+• Output objects change over time if they have write priority 16
+• Sophisticated control algorithms similar to real VAV systems
+• Environmental simulation (outdoor temp, humidity cycles)
+
+Usage:
+    python virtual_vav_device.py [--config vav.ini] [--points points.csv]
+"""
+
+import argparse
+import asyncio
+import configparser
+import csv
+import logging
+import math
+import random
+import re
+import time
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Any
+
+import numpy as np
+
+import BAC0
+from point_helpers import (
+    add_ai, add_ao, add_av,
+    add_bi, add_bo, add_bv,
+    add_mi, add_mo, add_mv
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Batched RNG: one generator call per tick per bucket instead of a
+# Python-level random.uniform round trip per object
+_rng = np.random.default_rng()
+
+# Bound locally so the per-object priority-16 helpers skip the module
+# attribute lookup on every call
+_rand = random.random
+
+# Single C-level lookup for the columns every row must have (Description
+# stays a row.get — the column is optional)
+_ROW_FIELDS = itemgetter('Type', 'Instance', 'Name', 'PresentValue')
+
+# Compiled once at import — these run against every CSV cell during load
+_BRACKET_RE = re.compile(r'\[(\d+)\]')
+_NUMBER_RE = re.compile(r'(-?\d+(?:\.\d+)?)')
+_STATES_RE = re.compile(r'\[(\d+)\]=([^,\]]+)')
+
+# CSV "Type" column → (adder method name, value coercion kind). One dict
+# probe per row instead of a nine-way string-compare chain. Both the
+# 'Multi State' and 'Multistate' spellings appear in the wild, so the
+# multistate entries are keyed under each.
+_ROW_DISPATCH = {
+    'Analog Input': ('_add_analog_input', 'analog'),
+    'Analog Output': ('_add_analog_output', 'analog'),
+    'Analog Value': ('_add_analog_value', 'analog'),
+    'Binary Input': ('_add_binary_input', 'binary'),
+    'Binary Output': ('_add_binary_output', 'binary'),
+    'Binary Value': ('_add_binary_value', 'binary'),
+    'Multi State Input': ('_add_multistate_input', 'multistate'),
+    'Multi State Output': ('_add_multistate_output', 'multistate'),
+    'Multi State Value': ('_add_multistate_value', 'multistate'),
+    'Multistate Input': ('_add_multistate_input', 'multistate'),
+    'Multistate Output': ('_add_multistate_output', 'multistate'),
+    'Multistate Value': ('_add_multistate_value', 'multistate'),
+}
+
+
+class VAVSimulator:
+    """Enhanced VAV simulator with CSV loading and realistic simulation"""
+
+    def __init__(self, config_file: str = "vav.ini", points_file: str = "points.csv"):
+        self.config = configparser.ConfigParser()
+        self.config.read(config_file)
+        self.points_file = points_file
+        self.bacnet_app = None
+        self.objects = {}
+        self.simulation_state = {}
+
+        # Per-category simulation buckets, filled once after loading
+        self._analog_inputs = []
+        self._binary_inputs = []
+        self._multistate_inputs = []
+        self._prio16_candidates = []
+
+        # Load configuration
+        self._load_config()
+
+    def _load_config(self):
+        """Load all configuration settings from the INI file"""
+        # Materialize any absent sections so the proxy getters (and their
+        # fallbacks) work uniformly instead of hitting a plain dict
+        for section in ('device', 'simulation', 'environment', 'control', 'missing_objects'):
+            if section not in self.config:
+                self.config.add_section(section)
+
+        # Device settings
+        device_section = self.config['device']
+        self.address = device_section.get('address', fallback='192.168.68.105/24')
+        self.port = device_section.getint('port', fallback=47808)
+        self.device_id = device_section.getint('device_id', fallback=3001)
+        self.device_name = device_section.get('device_name', fallback='Virtual VAV Unit')
+        self.device_description = device_section.get('device_description', fallback='Enhanced Virtual VAV BACnet Device')
+
+        # Simulation settings
+        sim_section = self.config['simulation']
+        self.step_interval = sim_section.getfloat('step_interval', fallback=0.5)
+        self.ai_variation = sim_section.getfloat('ai_variation_range', fallback=0.15)
+        self.ao_priority16_variation = sim_section.getfloat('ao_priority16_variation', fallback=0.25)
+        self.binary_flip_prob = sim_section.getfloat('binary_flip_probability', fallback=0.01)
+        self.multistate_interval = sim_section.getfloat('multistate_change_interval', fallback=20)
+        self.temp_drift_rate = sim_section.getfloat('temperature_drift_rate', fallback=0.05)
+        self.flow_variation = sim_section.getfloat('flow_variation_factor', fallback=0.1)
+
+        # Environment settings
+        env_section = self.config['environment']
+        self.outdoor_cycle_min = env_section.getfloat('outdoor_temp_cycle_minutes', fallback=20)
+        self.outdoor_base = env_section.getfloat('outdoor_temp_base', fallback=21.0)
+        self.outdoor_amplitude = env_section.getfloat('outdoor_temp_amplitude', fallback=6.0)
+        self.humidity_base = env_section.getfloat('humidity_base', fallback=40.0)
+        self.humidity_range = env_section.getfloat('humidity_range', fallback=35.0)
+        # Angular frequency of the outdoor cycle, so the per-tick sine is
+        # one multiply instead of rebuilding 2π/cycle_seconds every call
+        self._outdoor_omega = 2 * math.pi / (self.outdoor_cycle_min * 60)
+
+        # Control settings
+        ctrl_section = self.config['control']
+        self.temp_deadband = ctrl_section.getfloat('temperature_deadband', fallback=0.5)
+        self.control_gain = ctrl_section.getfloat('control_gain', fallback=4.0)
+        self.room_gain = ctrl_section.getfloat('room_thermal_gain', fallback=0.04)
+        self.fault_interval = ctrl_section.getfloat('fault_mean_interval_seconds', fallback=120)
+        self.max_flow_refresh = ctrl_section.getfloat('max_airflow_refresh_seconds', fallback=3600)
+
+        # Missing objects settings
+        missing_section = self.config['missing_objects']
+        self.add_analog_value = missing_section.getboolean('add_analog_value', fallback=True)
+        self.add_binary_value = missing_section.getboolean('add_binary_value', fallback=True)
+        self.add_multistate_value = missing_section.getboolean('add_multistate_value', fallback=True)
+        self.missing_desc = missing_section.get(
+            'missing_object_description',
+            fallback='This object does not exist on VAV but added for testing')
+
+    def _parse_present_value(self, value: str) -> float:
+        """Parse present value from CSV, handling various formats"""
+        if not value or value == '—':
+            return 0.0
+
+        # Most cells are already plain numbers — let float() handle those
+        # before paying for any regex work
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            pass
+
+        value = str(value).strip()
+
+        # Handle formats like "[1] Open", "72.5 °F", "1,226 cfm"
+        match = _BRACKET_RE.search(value)
+        if match:
+            return float(match.group(1))
+
+        # Extract first number found
+        match = _NUMBER_RE.search(value)
+        if match:
+            return float(match.group(1))
+
+        return 0.0
+
+    def _parse_multistate_states(self, description: str) -> List[str]:
+        """Parse multistate state names from description"""
+        if not description:
+            return ['State1', 'State2']
+
+        states = []
+        matches = _STATES_RE.findall(description)
+        if matches:
+            # Sort by state number and extract names
+            sorted_matches = sorted(matches, key=lambda x: int(x[0]))
+            states = [match[1].strip() for match in sorted_matches]
+
+        return states if states else ['State1', 'State2']
+
+    def _determine_units(self, name: str, present_value_str: str) -> str:
+        """Determine engineering units based on point name and value"""
+        name_lower = name.lower()
+        pv_lower = str(present_value_str).lower()
+
+        if 'temperature' in name_lower or 'temp' in name_lower:
+            if '°f' in pv_lower or 'fahrenheit' in pv_lower:
+                return 'degreesFahrenheit'
+            return 'degreesCelsius'
+        if 'flow' in name_lower or 'cfm' in pv_lower:
+            return 'cubicFeetPerMinute'
+        if 'percent' in name_lower or '%' in pv_lower:
+            return 'percent'
+        if 'humidity' in name_lower:
+            return 'percentRelativeHumidity'
+        if 'pressure' in name_lower:
+            return 'pascals'
+        if 'speed' in name_lower:
+            return 'percent'
+
+        return 'noUnits'
+
+    def _load_points_from_csv(self):
+        """Load all points from CSV file and create BACnet objects"""
+        points_path = Path(self.points_file)
+        if not points_path.exists():
+            raise FileNotFoundError(f"Points file not found: {self.points_file}")
+
+        with open(points_path, 'r', newline='') as csvfile:
+            reader = csv.DictReader(csvfile)
+
+            existing_types = set()
+
+            for row in reader:
+                obj_type, instance, name, present_value_str = _ROW_FIELDS(row)
+                obj_type = obj_type.strip()
+                instance = int(instance)
+                name = name.strip()
+                description = row.get('Description', '').strip()
+
+                present_value = self._parse_present_value(present_value_str)
+                units = self._determine_units(name, present_value_str)
+
+                existing_types.add(obj_type)
+
+                # Create the appropriate BACnet object; an unsupported type
+                # skips just that row rather than failing the whole load
+                entry = _ROW_DISPATCH.get(obj_type)
+                if entry is None:
+                    logger.warning(f"Skipping unsupported object type '{obj_type}' (instance {instance})")
+                    continue
+                adder_name, kind = entry
+                adder = getattr(self, adder_name)
+                if kind == 'analog':
+                    obj = adder(instance, name, units, present_value, description)
+                elif kind == 'binary':
+                    obj = adder(instance, name, bool(int(present_value)), description)
+                else:  # multistate
+                    states = self._parse_multistate_states(description)
+                    obj = adder(instance, name, states, int(present_value), description)
+
+                # Store object reference for simulation
+                self.objects[f"{obj_type}_{instance}"] = {
+                    'object': obj,
+                    'type': obj_type,
+                    'name': name,
+                    'instance': instance,
+                    'initial_value': present_value
+                }
+
+        # Add missing object types if configured
+        self._add_missing_object_types(existing_types)
+
+        # Bucket the objects once so the simulation loops touch only what
+        # they actually simulate
+        self._classify_for_simulation()
+
+        logger.info(f"Loaded {len(self.objects)} objects from {self.points_file}")
+
+    def _classify_for_simulation(self):
+        """Bucket objects by simulation role, once, after loading.
+
+        Type and name never change after creation, so the substring tests
+        and handler selection that used to run per object per tick happen
+        here instead. The only per-tick check left on the output path is
+        the priority-16 probe, which depends on live client writes.
+        """
+        self._analog_inputs = []
+        self._binary_inputs = []
+        self._multistate_inputs = []
+        self._prio16_candidates = []
+
+        for obj_key, obj_info in self.objects.items():
+            obj = obj_info['object']
+            obj_type = obj_info['type']
+            name = obj_info['name'].lower()
+
+            if obj_type == 'Analog Input':
+                self._analog_inputs.append((obj_key, obj, name))
+            elif obj_type == 'Binary Input':
+                self._binary_inputs.append((obj_key, obj, name))
+            elif obj_type == 'Multi State Input':
+                self._multistate_inputs.append((obj_key, obj, name))
+            elif 'Output' in obj_type or 'Value' in obj_type:
+                if 'Analog' in obj_type:
+                    handler = self._simulate_analog_output_priority16
+                elif 'Binary' in obj_type:
+                    handler = self._simulate_binary_output_priority16
+                else:  # Multistate / Multi State
+                    handler = self._simulate_multistate_output_priority16
+                self._prio16_candidates.append((obj_key, obj, handler))
+
+    def _add_missing_object_types(self, existing_types: set):
+        """Add missing object types for testing if configured"""
+        # Start missing object instances at 9000
+        next_instance = 9000
+
+        missing_objects = []
+
+        # Check which value object types are missing
+        if self.add_analog_value and 'Analog Value' not in existing_types:
+            missing_objects.append(('Analog Value', 'analogValue', 'Test Analog Value'))
+
+        if self.add_binary_value and 'Binary Value' not in existing_types:
+            missing_objects.append(('Binary Value', 'binaryValue', 'Test Binary Value'))
+
+        if (self.add_multistate_value
+                and 'Multistate Value' not in existing_types
+                and 'Multi State Value' not in existing_types):
+            missing_objects.append(('Multistate Value', 'multistateValue', 'Test Multistate Value'))
+
+        for obj_type_name, obj_type, name in missing_objects:
+            instance = next_instance
+            next_instance += 1
+
+            if obj_type == 'analogValue':
+                obj = self._add_analog_value(instance, name, 'noUnits', 0.0, self.missing_desc)
+            elif obj_type == 'binaryValue':
+                obj = self._add_binary_value(instance, name, False, self.missing_desc)
+            elif obj_type == 'multistateValue':
+                states = ['State1', 'State2', 'State3']
+                obj = self._add_multistate_value(instance, name, states, 1, self.missing_desc)
+
+            self.objects[f"{obj_type_name}_{instance}"] = {
+                'object': obj,
+                'type': obj_type_name,
+                'name': name,
+                'instance': instance,
+                'initial_value': 0
+            }
+            logger.info(f"Added missing {obj_type_name} object: {name}")
+
+    def _add_analog_input(self, instance: int, name: str, units: str, value: float, description: str):
+        """Add an analog input object"""
+        return add_ai(self.bacnet_app, instance, name, units, value, description)
+
+    def _add_analog_output(self, instance: int, name: str, units: str, value: float, description: str):
+        """Add an analog output object"""
+        return add_ao(self.bacnet_app, instance, name, units, value, description)
+
+    def _add_analog_value(self, instance: int, name: str, units: str, value: float, description: str):
+        """Add an analog value object"""
+        return add_av(self.bacnet_app, instance, name, units, value, description)
+
+    def _add_binary_input(self, instance: int, name: str, value: bool, description: str):
+        """Add a binary input object"""
+        return add_bi(self.bacnet_app, instance, name, value, description)
+
+    def _add_binary_output(self, instance: int, name: str, value: bool, description: str):
+        """Add a binary output object"""
+        return add_bo(self.bacnet_app, instance, name, value, description)
+
+    def _add_binary_value(self, instance: int, name: str, value: bool, description: str):
+        """Add a binary value object"""
+        return add_bv(self.bacnet_app, instance, name, value, description)
+
+    def _add_multistate_input(self, instance: int, name: str, states: List[str], value: int, description: str):
+        """Add a multistate input object"""
+        return add_mi(self.bacnet_app, instance, name, states, value, description)
+
+    def _add_multistate_output(self, instance: int, name: str, states: List[str], value: int, description: str):
+        """Add a multistate output object"""
+        return add_mo(self.bacnet_app, instance, name, states, value, description)
+
+    def _add_multistate_value(self, instance: int, name: str, states: List[str], value: int, description: str):
+        """Add a multistate value object"""
+        return add_mv(self.bacnet_app, instance, name, states, value, description)
+
+    def _has_write_priority_16(self, obj) -> bool:
+        """Check if object has a write at priority 16"""
+        try:
+            priority_array = getattr(obj, 'priorityArray', None)
+            if priority_array:
+                # Priority array is 1-indexed, so priority 16 is index 15
+                return priority_array[15] is not None
+            return False
+        except Exception:
+            return False
+
+    def _simulate_inputs(self):
+        """Simulate realistic changes for all input objects"""
+        current_time = time.time()
+
+        # One batched draw covers the whole analog bucket; each category
+        # scales its own slice of the unit noise inside the helper
+        if self._analog_inputs:
+            noise = _rng.uniform(-1.0, 1.0, len(self._analog_inputs))
+            for k, (obj_key, obj, name) in enumerate(self._analog_inputs):
+                try:
+                    self._simulate_analog_input(obj, name, current_time, noise[k])
+                except Exception as e:
+                    logger.warning(f"Error simulating {obj_key}: {e}")
+
+        # Sparse flips: draw how many inputs flip this tick, then pick
+        # which ones. The common case — zero flips — costs one binomial
+        # draw instead of a rejected coin toss per object.
+        n = len(self._binary_inputs)
+        if n:
+            k = int(_rng.binomial(n, self.binary_flip_prob))
+            if k:
+                for i in _rng.choice(n, size=k, replace=False):
+                    obj_key, obj, name = self._binary_inputs[i]
+                    try:
+                        obj.presentValue = not obj.presentValue
+                    except Exception as e:
+                        logger.warning(f"Error simulating {obj_key}: {e}")
+
+        for obj_key, obj, name in self._multistate_inputs:
+            try:
+                self._simulate_multistate_input(obj, name, current_time)
+            except Exception as e:
+                logger.warning(f"Error simulating {obj_key}: {e}")
+
+    def _simulate_analog_input(self, obj, name: str, current_time: float, noise: float):
+        """Simulate realistic analog input changes.
+
+        ``noise`` is this object's uniform(-1, 1) draw from the per-tick
+        batch; each category scales it to its own range.
+        """
+        if 'temperature' in name and 'outdoor' in name:
+            # Outdoor temperature follows a sinusoidal cycle
+            obj.presentValue = self.outdoor_base + \
+                self.outdoor_amplitude * math.sin(self._outdoor_omega * current_time)
+
+        elif 'temperature' in name and 'space' in name:
+            # Space temperature drifts slowly
+            if not hasattr(obj, '_drift_direction'):
+                obj._drift_direction = random.choice([-1, 1])
+                obj._drift_change_time = current_time + random.uniform(30, 120)
+
+            if current_time > obj._drift_change_time:
+                obj._drift_direction = random.choice([-1, 1])
+                obj._drift_change_time = current_time + random.uniform(30, 120)
+
+            obj.presentValue += obj._drift_direction * self.temp_drift_rate * (1.0 + 0.5 * noise)
+            obj.presentValue = max(65, min(85, obj.presentValue))
+
+        elif 'flow' in name:
+            # Airflow varies around a base value
+            base_flow = getattr(obj, '_base_flow', obj.presentValue)
+            if not hasattr(obj, '_base_flow'):
+                obj._base_flow = base_flow
+
+            variation = base_flow * self.flow_variation * noise
+            obj.presentValue = max(0, base_flow + variation)
+
+        elif 'humidity' in name:
+            # Humidity random walk within bounds
+            obj.presentValue += 0.5 * noise
+            obj.presentValue = max(20, min(80, obj.presentValue))
+
+        elif 'position' in name or 'valve' in name:
+            # Positions vary within 0-100%
+            obj.presentValue += self.ai_variation * noise
+            obj.presentValue = max(0, min(100, obj.presentValue))
+
+        else:
+            # Generic analog input variation
+            obj.presentValue += self.ai_variation * noise
+
+    def _simulate_multistate_input(self, obj, name: str, current_time: float):
+        """Simulate multistate input changes"""
+        if not hasattr(obj, '_next_change_time'):
+            obj._next_change_time = current_time + random.uniform(10, self.multistate_interval)
+
+        if current_time >= obj._next_change_time:
+            # Change to a different state
+            current_state = obj.presentValue
+            num_states = getattr(obj, 'numberOfStates', 2)
+
+            new_state = current_state
+            while new_state == current_state:
+                new_state = random.randint(1, num_states)
+
+            obj.presentValue = new_state
+            obj._next_change_time = current_time + random.uniform(10, self.multistate_interval)
+
+    def _simulate_outputs_with_priority16(self):
+        """Simulate changes for output objects that have write priority 16"""
+        for obj_key, obj, handler in self._prio16_candidates:
+            if not self._has_write_priority_16(obj):
+                continue
+
+            try:
+                handler(obj)
+            except Exception as e:
+                logger.warning(f"Error simulating priority 16 for {obj_key}: {e}")
+
+    def _simulate_analog_output_priority16(self, obj):
+        """Simulate analog output changes at priority 16"""
+        try:
+            current_value = obj.presentValue
+            variation = self.ao_priority16_variation * (2.0 * _rand() - 1.0)
+            new_value = current_value + variation
+
+            # Apply reasonable bounds based on units
+            if hasattr(obj, 'units'):
+                if 'percent' in str(obj.units).lower():
+                    new_value = max(0, min(100, new_value))
+                elif 'temperature' in str(obj.units).lower():
+                    new_value = max(32, min(120, new_value))
+
+            obj.presentValue = new_value
+        except Exception as e:
+            logger.debug(f"Could not simulate analog output priority 16: {e}")
+
+    def _simulate_binary_output_priority16(self, obj):
+        """Simulate binary output changes at priority 16"""
+        if _rand() < self.binary_flip_prob * 2:
+            obj.presentValue = not obj.presentValue
+
+    def _simulate_multistate_output_priority16(self, obj):
+        """Simulate multistate output changes at priority 16"""
+        if _rand() < 0.05:
+            current_state = obj.presentValue
+            num_states = getattr(obj, 'numberOfStates', 2)
+
+            new_state = current_state
+            while new_state == current_state and num_states > 1:
+                new_state = random.randint(1, num_states)
+
+            obj.presentValue = new_state
+
+    async def run_simulation(self):
+        """Main simulation loop"""
+        logger.info(f"Starting simulation with {self.step_interval}s intervals")
+
+        # Pace by absolute monotonic deadlines rather than sleeping the
+        # full interval after each pass, so the cost of a tick does not
+        # stretch the effective rate
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+
+        while True:
+            try:
+                # Simulate input objects
+                self._simulate_inputs()
+
+                # Simulate output objects with priority 16 writes
+                self._simulate_outputs_with_priority16()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Simulation error: {e}")
+
+            deadline += self.step_interval
+            delay = deadline - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    break
+            else:
+                deadline = loop.time()  # fell behind - resync, don't burst
+
+    async def start(self):
+        """Start the BACnet device and simulation"""
+        try:
+            self.bacnet_app = BAC0.lite(
+                ip=self.address,
+                port=self.port,
+                deviceId=self.device_id
+            )
+
+            # Load all points from CSV
+            self._load_points_from_csv()
+
+            logger.info(f"✓ Virtual VAV device {self.device_id} online at {self.address}:{self.port}")
+            logger.info(f"✓ Loaded {len(self.objects)} BACnet objects")
+
+            # Run the simulation
+            await self.run_simulation()
+
+        except Exception as e:
+            logger.error(f"Failed to start VAV simulator: {e}")
+            raise
+        finally:
+            if self.bacnet_app:
+                self.bacnet_app.disconnect()
+                logger.info("BACnet application disconnected")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Enhanced Virtual VAV BACnet Device Simulator',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        '--config', '-c',
+        default='vav.ini',
+        help='Configuration INI file path'
+    )
+    parser.add_argument(
+        '--points', '-p',
+        default='points.csv',
+        help='Points CSV file path'
+    )
+
+    args = parser.parse_args()
+
+    # Create and start the simulator
+    simulator = VAVSimulator(args.config, args.points)
+
+    try:
+        asyncio.run(simulator.start())
+    except KeyboardInterrupt:
+        logger.info("Simulation stopped by user")
+    except Exception as e:
+        logger.error(f"Simulation failed: {e}")
+
+
+if __name__ == "__main__":
+    main()